@@ -1,11 +1,17 @@
 # generators/artifacts/code.py
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, Tuple
 from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from functools import lru_cache
 from datetime import datetime
 from uuid import UUID
 from pathlib import Path
 import re
 import ast
+import hashlib
+import json
+import sqlite3
 from models.artifacts import (
     Artifact,
     ArtifactType,
@@ -14,6 +20,30 @@ from models.artifacts import (
     ValidationResult
 )
 
+try:
+    import black
+    import autopep8
+except ImportError:
+    black = autopep8 = None
+
+# Discouraged JavaScript calls and the TypeScript 'any' type, matched on word
+# boundaries so identifiers such as 'many' or 'medieval(' are not flagged
+_JS_DISCOURAGED_CALLS = re.compile(r'\b(eval|with)\s*\(')
+_TS_ANY_TYPE = re.compile(r'(?<![A-Za-z_$])any(?![A-Za-z0-9_$])')
+
+# AST node types that each add one branch to cyclomatic complexity
+_COMPLEXITY_NODES = (ast.If, ast.While, ast.For, ast.ExceptHandler)
+
+_VALIDATION_CACHE_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS validations "
+    "(key BLOB PRIMARY KEY, formatted TEXT, result_json TEXT)"
+)
+
+@lru_cache(maxsize=32)
+def _parse_python(content: str) -> ast.Module:
+    """Parse Python source to an AST, memoized for repeated content."""
+    return compile(content, '<artifact>', 'exec', flags=ast.PyCF_ONLY_AST, dont_inherit=True)
+
 @dataclass
 class CodeGenerationConfig:
     """Configuration for code generation."""
@@ -25,12 +55,14 @@ class CodeGenerationConfig:
     include_type_hints: bool = True
     formatting: Dict[str, Any] = None
     linting_rules: Dict[str, Any] = None
+    cache_path: Optional[Union[str, Path]] = None
 
 class CodeGenerator:
     """Generator for code artifacts."""
 
     def __init__(self, config: Optional[CodeGenerationConfig] = None):
         self.config = config or CodeGenerationConfig(language="python")
+        self._lang_key = (self.config.language or "python").lower()
         self.formatters: Dict[str, callable] = {}
         self.validators: Dict[str, callable] = {}
         self.style_checkers: Dict[str, callable] = {}
@@ -56,13 +88,20 @@ class CodeGenerator:
             if metadata is not None and not isinstance(metadata, dict):
                 raise ArtifactError("Metadata must be a dictionary")
 
-            # Validate and format code
-            try:
-                formatted_code = self._format_code(content)
-            except Exception as e:
-                raise ArtifactError(f"Code formatting failed: {str(e)}")
+            # Validate and format code, reusing persisted results when available
+            cache_key = self._validation_cache_key(content)
+            cached = self._load_cached_validation(cache_key)
+            if cached is not None:
+                formatted_code, validation_result = cached
+            else:
+                try:
+                    formatted_code = self._format_code(content)
+                except Exception as e:
+                    raise ArtifactError(f"Code formatting failed: {str(e)}")
+
+                validation_result = self._validate_code(formatted_code)
+                self._store_cached_validation(cache_key, formatted_code, validation_result)
 
-            validation_result = self._validate_code(formatted_code)
             if not validation_result.valid:
                 raise ArtifactError(
                     f"Code validation failed: {', '.join(validation_result.errors)}"
@@ -100,6 +139,31 @@ class CodeGenerator:
         except Exception as e:
             raise ArtifactError(f"Code generation failed: {str(e)}")
 
+    def generate_code_artifacts_batch(self,
+                                      items: List[Tuple[str, str, str, Optional[Dict[str, Any]]]],
+                                      max_workers: Optional[int] = None) -> List[Artifact]:
+        """Generate code artifacts in parallel across worker processes.
+
+        Each item is a ``(content, identifier, title, metadata)`` tuple; results
+        are returned in input order.
+        """
+        if not items:
+            return []
+
+        try:
+            contents, identifiers, titles, metadatas = zip(*items)
+        except (TypeError, ValueError) as e:
+            raise ArtifactError(f"Invalid batch item: {str(e)}")
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                self.generate_code_artifact,
+                contents,
+                identifiers,
+                titles,
+                metadatas
+            ))
+
     def _initialize_processors(self) -> None:
         """Initialize code processors."""
         # Format processors
@@ -123,9 +187,14 @@ class CodeGenerator:
             "typescript": self._check_typescript_style
         })
 
+        # Resolve processors for the configured language once
+        self._formatter = self.formatters.get(self._lang_key)
+        self._validator = self.validators.get(self._lang_key)
+        self._style_checker = self.style_checkers.get(self._lang_key)
+
     def _format_code(self, content: str) -> str:
         """Format code according to language rules."""
-        formatter = self.formatters.get(self.config.language.lower())
+        formatter = self._formatter
         if not formatter:
             return content
         return formatter(content)
@@ -140,16 +209,16 @@ class CodeGenerator:
             errors.append("Code content cannot be empty")
 
         # Language-specific validation
-        validator = self.validators.get(self.config.language.lower())
+        validator = self._validator
         if validator:
             result = validator(content)
             errors.extend(result.get('errors', []))
             warnings.extend(result.get('warnings', []))
 
         # Style validation
-        style_checker = self.style_checkers.get(self.config.language.lower())
+        style_checker = self._style_checker
         if style_checker and self.config.style_guide:
-            style_issues = style_checker(content)
+            style_issues = style_checker(content, content.split('\n'))
             warnings.extend(style_issues)
 
         # Length validation
@@ -164,10 +233,10 @@ class CodeGenerator:
 
     def _format_python(self, content: str) -> str:
         """Format Python code."""
-        try:
-            import black
-            import autopep8
+        if black is None or autopep8 is None:
+            return content  # Return unformatted if formatters not available
 
+        try:
             # Apply autopep8 for basic formatting
             content = autopep8.fix_code(
                 content,
@@ -184,8 +253,6 @@ class CodeGenerator:
 
             return content
 
-        except ImportError:
-            return content  # Return unformatted if formatters not available
         except Exception as e:
             raise ArtifactError(f"Python formatting failed: {str(e)}")
 
@@ -227,19 +294,19 @@ class CodeGenerator:
 
         try:
             # Syntax validation
-            ast.parse(content)
+            tree = _parse_python(content)
         except SyntaxError as e:
             errors.append(f"Syntax error: {str(e)}")
             return {'errors': errors, 'warnings': warnings}
 
         # Check imports
         import_checker = ImportChecker()
-        import_checker.visit(ast.parse(content))
+        import_checker.visit(tree)
         warnings.extend(import_checker.issues)
 
         # Check complexity
         complexity_checker = ComplexityChecker()
-        complexity_checker.visit(ast.parse(content))
+        complexity_checker.visit(tree)
         warnings.extend(complexity_checker.issues)
 
         return {
@@ -265,9 +332,12 @@ class CodeGenerator:
                 errors.append("Unmatched parentheses")
             
             # Check for common issues
-            if 'eval(' in content:
+            discouraged = {
+                match.group(1) for match in _JS_DISCOURAGED_CALLS.finditer(content)
+            }
+            if 'eval' in discouraged:
                 warnings.append("Use of eval() is discouraged")
-            if 'with(' in content:
+            if 'with' in discouraged:
                 warnings.append("Use of with() is discouraged")
 
         except Exception as e:
@@ -284,29 +354,36 @@ class CodeGenerator:
         result = self._validate_javascript(content)
         
         # Additional TypeScript-specific checks
-        if 'any' in content:
+        if _TS_ANY_TYPE.search(content):
             result['warnings'].append("Use of 'any' type should be avoided")
         
         return result
 
-    def _check_python_style(self, content: str) -> List[str]:
+    def _check_python_style(self, content: str,
+                            lines: Optional[List[str]] = None) -> List[str]:
         """Check Python code style."""
         issues = []
+        if lines is None:
+            lines = content.split('\n')
 
         try:
             # Check line length
             max_line_length = self.config.style_guide.get('max_line_length', 88)
-            for i, line in enumerate(content.split('\n'), 1):
-                if len(line) > max_line_length:
-                    issues.append(f"Line {i} exceeds maximum length of {max_line_length}")
+            issues.extend(
+                f"Line {i} exceeds maximum length of {max_line_length}"
+                for i, length in enumerate(map(len, lines), 1)
+                if length > max_line_length
+            )
 
             # Check naming conventions
-            for node in ast.walk(ast.parse(content)):
+            for node in ast.walk(_parse_python(content)):
                 if isinstance(node, ast.ClassDef):
-                    if not node.name[0].isupper():
+                    first = node.name[:1]
+                    if first and not first.isupper():
                         issues.append(f"Class '{node.name}' should use CapWords convention")
                 elif isinstance(node, ast.FunctionDef):
-                    if not node.name.islower():
+                    # Underscore-only names such as '_' have no cased characters
+                    if not node.name.islower() and node.name.strip('_'):
                         issues.append(f"Function '{node.name}' should use lowercase_with_underscores")
 
         except Exception as e:
@@ -314,17 +391,20 @@ class CodeGenerator:
 
         return issues
 
-    def _check_javascript_style(self, content: str) -> List[str]:
+    def _check_javascript_style(self, content: str,
+                                lines: Optional[List[str]] = None) -> List[str]:
         """Check JavaScript code style."""
         issues = []
+        if lines is None:
+            lines = content.split('\n')
 
         # Check semicolon usage
-        lines = content.split('\n')
-        for i, line in enumerate(lines, 1):
-            line = line.strip()
-            if line and not line.endswith('{') and not line.endswith('}'):
-                if not line.endswith(';'):
-                    issues.append(f"Line {i} missing semicolon")
+        stripped_lines = [line.strip() for line in lines]
+        issues.extend(
+            f"Line {i} missing semicolon"
+            for i, line in enumerate(stripped_lines, 1)
+            if line and not line.endswith(('{', '}', ';'))
+        )
 
         # Check spacing around operators
         operator_pattern = r'[^=!<>]=[^=]|[+\-*/%]=?(?!=)|===?|!==?|<=?|>=?'
@@ -336,13 +416,16 @@ class CodeGenerator:
 
         return issues
 
-    def _check_typescript_style(self, content: str) -> List[str]:
+    def _check_typescript_style(self, content: str,
+                                lines: Optional[List[str]] = None) -> List[str]:
         """Check TypeScript code style."""
+        if lines is None:
+            lines = content.split('\n')
+
         # Include JavaScript style checks
-        issues = self._check_javascript_style(content)
+        issues = self._check_javascript_style(content, lines)
 
         # Additional TypeScript-specific checks
-        lines = content.split('\n')
         for i, line in enumerate(lines, 1):
             # Check interface naming
             if 'interface' in line and not re.search(r'interface\s+I[A-Z]', line):
@@ -354,9 +437,59 @@ class CodeGenerator:
 
         return issues
 
+    def _validation_cache_key(self, content: str) -> bytes:
+        """Build cache key from content and the config that affects validation."""
+        config_state = json.dumps(
+            [self.config.language, self.config.style_guide, self.config.max_length],
+            sort_keys=True,
+            default=str
+        )
+        digest = hashlib.sha256(config_state.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(content.encode('utf-8'))
+        return digest.digest()
+
+    def _load_cached_validation(self, key: bytes) -> Optional[Tuple[str, ValidationResult]]:
+        """Load formatted code and validation result from the disk cache."""
+        if not self.config.cache_path:
+            return None
+
+        try:
+            with closing(sqlite3.connect(str(self.config.cache_path))) as conn:
+                conn.execute(_VALIDATION_CACHE_SCHEMA)
+                row = conn.execute(
+                    "SELECT formatted, result_json FROM validations WHERE key = ?",
+                    (key,)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+
+        if row is None:
+            return None
+
+        formatted, result_json = row
+        return formatted, ValidationResult(**json.loads(result_json))
+
+    def _store_cached_validation(self, key: bytes, formatted: str,
+                                 result: ValidationResult) -> None:
+        """Persist formatted code and validation result to the disk cache."""
+        if not self.config.cache_path:
+            return
+
+        try:
+            Path(self.config.cache_path).parent.mkdir(parents=True, exist_ok=True)
+            with closing(sqlite3.connect(str(self.config.cache_path))) as conn:
+                with conn:
+                    conn.execute(_VALIDATION_CACHE_SCHEMA)
+                    conn.execute(
+                        "INSERT OR REPLACE INTO validations VALUES (?, ?, ?)",
+                        (key, formatted, json.dumps(result.to_dict()))
+                    )
+        except (OSError, sqlite3.Error):
+            pass  # Caching is best-effort; generation already succeeded
+
     def _generate_checksum(self, content: str) -> str:
         """Generate checksum for code content."""
-        import hashlib
         return hashlib.sha256(content.encode('utf-8')).hexdigest()
 
 
@@ -397,8 +530,9 @@ class ComplexityChecker(ast.NodeVisitor):
         """Calculate cyclomatic complexity."""
         complexity = 1
         for child in ast.walk(node):
-            if isinstance(child, (ast.If, ast.While, ast.For, ast.And, ast.Or)):
-                complexity += 1
-            elif isinstance(child, ast.ExceptHandler):
+            if isinstance(child, _COMPLEXITY_NODES):
                 complexity += 1
+            elif isinstance(child, ast.BoolOp):
+                # 'a and b and c' is a single BoolOp with two short-circuits
+                complexity += len(child.values) - 1
         return complexity
\ No newline at end of file
@@ -1,8 +1,11 @@
 # generators/artifacts/markdown.py
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, Iterable, Iterator, Tuple
+from collections import OrderedDict
 from dataclasses import dataclass
+from functools import cached_property
 from datetime import datetime
 from uuid import UUID
+import hashlib
 import re
 from models.artifacts import (
     Artifact,
@@ -12,6 +15,93 @@ from models.artifacts import (
     ValidationResult
 )
 
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
+# Block-level patterns
+_ATX_HEADER = re.compile(r'^(#{1,6})\s*(.+?)(?:\s*#+\s*)?$')
+_TOC_HEADER = re.compile(r'^(#{1,6})\s+(.+?)(?:\s*#+\s*)?$')
+_UL_ITEM = re.compile(r'^[-*+]\s')
+_OL_ITEM = re.compile(r'^\d+\.\s')
+_CODE_FENCE = re.compile(r'^(`{3,}|~{3,})')
+_FENCE_LANGUAGE = re.compile(r'^[`~]+\w+$')
+
+# Inline patterns
+_INLINE_LINK = re.compile(r'\[([^\]]+)\]\(([^)"]+)(?:\s+"([^"]+)")?\)')
+_REFERENCE_DEF = re.compile(r'^\[([^\]]+)\]:\s*(\S+)(?:\s+"([^"]+)")?\s*$', re.MULTILINE)
+_REFERENCE_USE = re.compile(r'\[([^\]]+)\]\[([^\]]*)\]')
+_LINK_FORMS = re.compile(
+    r'(?P<inline>\[(?P<inline_text>[^\]]+)\]\((?P<inline_url>[^)"]+)(?:\s+"[^"]+")?\))'
+    r'|(?P<refdef>^\[(?P<def_label>[^\]]+)\]:\s*(?P<def_url>\S+)(?:\s+"[^"]+")?\s*$)'
+    r'|(?P<refuse>\[(?P<use_text>[^\]]+)\]\[(?P<use_label>[^\]]*)\])',
+    re.MULTILINE
+)
+_IMAGE = re.compile(r'!\[([^\]]+)\]\(([^)"]+)(?:\s+"([^"]+)")?\)')
+_IMAGE_ANY_ALT = re.compile(r'!\[([^\]]*)\]\(([^)"]+)(?:\s+"[^"]+")?\)')
+_EMPHASIS_ASTERISK = re.compile(r'\*([^\*]+)\*')
+_EMPHASIS_UNDERSCORE = re.compile(r'_([^_]+)_')
+_STRONG_ASTERISK = re.compile(r'\*\*([^\*]+)\*\*')
+_STRONG_UNDERSCORE = re.compile(r'__([^_]+)__')
+_ANCHOR_INVALID = re.compile(r'[^\w\-]')
+
+_IMAGE_EXTENSIONS = frozenset({'png', 'jpg', 'jpeg', 'gif', 'svg'})
+
+# Anchor slugs: spaces become hyphens and other ASCII non-word characters
+# are dropped; _ANCHOR_INVALID handles anything outside ASCII
+_ANCHOR_TABLE = {
+    code: None for code in range(128)
+    if not (chr(code).isalnum() or chr(code) in '_-')
+}
+_ANCHOR_TABLE[ord(' ')] = ord('-')
+
+# Cleanup and formatting patterns
+_CODE_SPAN_SPACING = re.compile(r'\s*`([^`]+)`\s*')
+_HORIZONTAL_RULE = re.compile(r'^[-*_]{3,}\s*$', re.MULTILINE)
+_UL_MARKER = re.compile(r'^([ \t]*)[*+-]', re.MULTILINE)
+
+# Metadata patterns
+_TITLE = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+_TAG = re.compile(r'#(\w+)')
+_LINK = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+_FENCE_LANGUAGE_TAG = re.compile(r'```(\w+)')
+
+def _header_level(line: str) -> int:
+    """Return the count of leading '#' characters when followed by whitespace."""
+    if not line.startswith('#'):
+        return 0
+    level = len(line) - len(line.lstrip('#'))
+    return level if line[level:level + 1].isspace() else 0
+
+def _collect_header_lines(lines: Iterable[str], header_lines: List[str]) -> Iterator[str]:
+    """Pass lines through, appending those starting with '#' to header_lines."""
+    for line in lines:
+        if line.startswith('#'):
+            header_lines.append(line)
+        yield line
+
+def _is_bare_list_marker(line: str) -> bool:
+    """Check whether a line holds only a list marker like '-' or '1.'."""
+    marker = line.rstrip()
+    if marker in ('-', '*', '+'):
+        return True
+    return (len(marker) >= 2 and marker[-1] == '.'
+            and not marker[:-1].strip('0123456789'))
+
+def _is_table_separator(stripped: str) -> bool:
+    """Check whether a stripped line is a table header separator like |---|:-:|."""
+    body = stripped[1:].lstrip() if stripped.startswith('|') else stripped
+    return len(body) >= 2 and body[0] in '-:' and not body.strip('-|: ')
+
+def _split_table_row(stripped: str) -> List[str]:
+    """Split a stripped table row into cells, dropping the outer pipes."""
+    if len(stripped) >= 2 and stripped[0] == '|' and stripped[-1] == '|':
+        cells = stripped[1:-1].split('|')
+    else:
+        cells = stripped.split('|')[1:-1]
+    return [cell.strip() for cell in cells]
+
 @dataclass
 class MarkdownGenerationConfig:
     """Configuration for markdown generation."""
@@ -22,15 +112,18 @@ class MarkdownGenerationConfig:
     image_validation: bool = True
     formatting_rules: Dict[str, Any] = None
     custom_extensions: List[str] = None
+    checksum_algorithm: str = "sha256"  # or "blake3" when the package is installed
 
 class MarkdownGenerator:
     """Generator for markdown artifacts."""
 
+    # Number of processed documents kept per generator instance
+    RESULT_CACHE_SIZE = 64
+
     def __init__(self, config: Optional[MarkdownGenerationConfig] = None):
         self.config = config or MarkdownGenerationConfig()
-        self.processors: Dict[str, callable] = {}
-        self.validators: Dict[str, callable] = {}
-        self._initialize_processors()
+        self._use_blake3 = self.config.checksum_algorithm == "blake3" and blake3 is not None
+        self._result_cache: OrderedDict = OrderedDict()
 
     def generate_markdown_artifact(self,
                                 content: str,
@@ -40,7 +133,7 @@ class MarkdownGenerator:
         """Generate a markdown artifact."""
         try:
             # Validate inputs
-            if not content:
+            if not content or content.isspace():
                 raise ArtifactError("Markdown content cannot be empty")
                 
             if not identifier:
@@ -52,14 +145,9 @@ class MarkdownGenerator:
             if metadata is not None and not isinstance(metadata, dict):
                 raise ArtifactError("Metadata must be a dictionary")
 
-            # Process and format content
-            try:
-                processed_content = self._process_content(content)
-            except Exception as e:
-                raise ArtifactError(f"Content processing failed: {str(e)}")
-
-            # Validate content
-            validation_result = self._validate_content(processed_content)
+            # Process and validate content
+            processed_content, validation_result, size, checksum = \
+                self._process_and_validate(content)
             if not validation_result.valid:
                 raise ArtifactError(
                     f"Markdown validation failed: {', '.join(validation_result.errors)}"
@@ -67,14 +155,17 @@ class MarkdownGenerator:
 
             try:
                 # Create metadata
+                custom_data = metadata or {}
+                if self._use_blake3:
+                    custom_data = {**custom_data, 'checksum_algorithm': 'blake3'}
                 artifact_metadata = ArtifactMetadata(
                     created_at=datetime.now(),
                     modified_at=datetime.now(),
                     version="1.0.0",
                     creator="MarkdownGenerator",
-                    size=len(processed_content.encode('utf-8')),
-                    checksum=self._generate_checksum(processed_content),
-                    custom_data=metadata or {}
+                    size=size,
+                    checksum=checksum,
+                    custom_data=custom_data
                 )
             except Exception as e:
                 raise ArtifactError(f"Failed to create artifact metadata: {str(e)}")
@@ -96,40 +187,141 @@ class MarkdownGenerator:
         except Exception as e:
             raise ArtifactError(f"Markdown generation failed: {str(e)}")
 
-    def _initialize_processors(self) -> None:
-        """Initialize markdown processors."""
-        # Content processors
-        self.processors.update({
+    def _process_and_validate(self, content: str) -> Tuple[str, ValidationResult, int, str]:
+        """Process and validate content, reusing results for repeated input.
+
+        Returns the processed content, its validation result, and the UTF-8
+        size and checksum of the processed content.
+        """
+        cache_key = (content, repr(self.config))
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            self._result_cache.move_to_end(cache_key)
+            processed_content, validation_result, size, checksum = cached
+        else:
+            # Process and format content
+            try:
+                processed_content = self._process_content(content)
+            except Exception as e:
+                raise ArtifactError(f"Content processing failed: {str(e)}")
+
+            # Validate content
+            validation_result = self._validate_content(processed_content)
+
+            # Encode once for both size and checksum so cache hits skip both
+            encoded_content = processed_content.encode('utf-8')
+            size = len(encoded_content)
+            checksum = self._generate_checksum(encoded_content)
+
+            self._result_cache[cache_key] = (processed_content, validation_result, size, checksum)
+            if len(self._result_cache) > self.RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+
+        # Hand out a copy so artifacts never share mutable result lists
+        return processed_content, ValidationResult(
+            valid=validation_result.valid,
+            errors=list(validation_result.errors),
+            warnings=list(validation_result.warnings)
+        ), size, checksum
+
+    @cached_property
+    def processors(self) -> Dict[str, callable]:
+        """Markdown content processors in application order, built on first access."""
+        return {
             'headers': self._process_headers,
             'links': self._process_links,
             'images': self._process_images,
             'lists': self._process_lists,
             'code_blocks': self._process_code_blocks,
             'tables': self._process_tables
-        })
+        }
 
-        # Content validators
-        self.validators.update({
+    @cached_property
+    def validators(self) -> Dict[str, callable]:
+        """Markdown content validators, built on first access."""
+        return {
             'structure': self._validate_structure,
             'links': self._validate_links,
             'images': self._validate_images,
             'formatting': self._validate_formatting
-        })
+        }
+
+    @cached_property
+    def _line_stages(self) -> Dict[callable, callable]:
+        """Line generators behind the built-in line processors."""
+        return {
+            self._process_headers: self._header_lines,
+            self._process_lists: self._list_lines,
+            self._process_code_blocks: self._code_block_lines,
+            self._process_tables: self._table_lines
+        }
+
+    @cached_property
+    def _triggers(self) -> Dict[callable, callable]:
+        """Checks telling whether a built-in processor can change the text."""
+        return {
+            self._process_headers: lambda text: (text.startswith('#') or '\n#' in text
+                                                 or '\n=' in text or '\n-' in text),
+            self._process_links: lambda text: '[' in text,
+            self._process_images: lambda text: '![' in text,
+            self._process_code_blocks: lambda text: ('```' in text or '~~~' in text
+                                                     or '    ' in text),
+            self._process_tables: lambda text: '|' in text
+        }
 
     def _process_content(self, content: str) -> str:
         """Process markdown content."""
         processed_content = content
-
-        # Apply processors
+        header_lines = None
+
+        # Apply processors in registry order. Runs of consecutive line
+        # processors are chained as generators so the text is split and joined
+        # once per run, and built-in processors whose trigger characters are
+        # absent are skipped. The built-in stages never introduce each other's
+        # trigger characters, so pending stages are checked against the text
+        # entering their chain.
+        chain = []
         for processor in self.processors.values():
+            trigger = self._triggers.get(processor)
+            if trigger is not None and not trigger(processed_content):
+                continue
+            stage = self._line_stages.get(processor)
+            if stage is not None:
+                chain.append(stage)
+                continue
+            if chain:
+                processed_content, _ = self._run_line_stages(processed_content, chain)
+                chain = []
             processed_content = processor(processed_content)
+            header_lines = None
+        if chain:
+            processed_content, header_lines = self._run_line_stages(processed_content, chain)
 
-        # Add table of contents if enabled
+        # Add table of contents if enabled, reusing the header lines of the
+        # final chain when nothing rewrote the text after it
         if self.config.toc_enabled:
-            processed_content = self._add_table_of_contents(processed_content)
+            processed_content = self._add_table_of_contents(processed_content, header_lines)
 
         return processed_content
 
+    def _run_line_stages(self, content: str,
+                         stages: List[callable]) -> Tuple[str, List[str]]:
+        """Stream content through chained line stages with one split and join.
+
+        Also returns the lines starting with '#' as they leave the header
+        stage, or as they enter the chain when it has none; the other stages
+        only rewrite lists, code and tables.
+        """
+        header_lines = []
+        lines = content.split('\n')
+        if self._header_lines not in stages:
+            lines = _collect_header_lines(lines, header_lines)
+        for stage in stages:
+            lines = stage(lines)
+            if stage == self._header_lines:
+                lines = _collect_header_lines(lines, header_lines)
+        return '\n'.join(lines), header_lines
+
     def _validate_content(self, content: str) -> ValidationResult:
         """Validate markdown content."""
         errors = []
@@ -153,32 +345,40 @@ class MarkdownGenerator:
 
     def _process_headers(self, content: str) -> str:
         """Process markdown headers."""
-        lines = content.split('\n')
-        processed_lines = []
-        header_levels = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0}
+        return '\n'.join(self._header_lines(content.split('\n')))
+
+    def _header_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        """Normalize ATX headers and convert Setext headers to ATX."""
+        atx_match = _ATX_HEADER.match
+        pending = None
+        has_pending = False
 
         for line in lines:
+            first = line[:1]
+
             # Process ATX headers (#)
-            header_match = re.match(r'^(#{1,6})\s*(.+?)(?:\s*#+\s*)?$', line)
+            header_match = atx_match(line) if first == '#' else None
             if header_match:
                 level = len(header_match.group(1))
                 text = header_match.group(2).strip()
-                header_levels[level] += 1
-                processed_lines.append(f"{'#' * level} {text}")
-                continue
+                line = f"{'#' * level} {text}"
 
             # Process Setext headers (=== or ---)
-            if line.strip() and processed_lines:
+            elif has_pending and first and first in '=-':
                 if line.strip('=') == '':
-                    processed_lines[-1] = f"# {processed_lines[-1]}"
+                    pending = f"# {pending}"
                     continue
                 elif line.strip('-') == '':
-                    processed_lines[-1] = f"## {processed_lines[-1]}"
+                    pending = f"## {pending}"
                     continue
 
-            processed_lines.append(line)
+            if has_pending:
+                yield pending
+            pending = line
+            has_pending = True
 
-        return '\n'.join(processed_lines)
+        if has_pending:
+            yield pending
 
     def _process_links(self, content: str) -> str:
         """Process markdown links."""
@@ -196,33 +396,37 @@ class MarkdownGenerator:
             return f'[{text}]({url})'
 
         # Process inline links
-        content = re.sub(r'\[([^\]]+)\]\(([^)"]+)(?:\s+"([^"]+)")?\)',
-                        process_link, content)
+        content = _INLINE_LINK.sub(process_link, content)
 
         # Process reference links
-        references = {}
-        def collect_reference(match):
-            label = match.group(1).lower()
-            url = match.group(2)
-            title = match.group(3) if match.group(3) else ''
-            references[label] = (url, title)
-            return ''
-
-        content = re.sub(r'^\[([^\]]+)\]:\s*(\S+)(?:\s+"([^"]+)")?\s*$',
-                        collect_reference, content, flags=re.MULTILINE)
+        content, references = self._extract_references(content)
 
         # Sort and append references
         if references:
-            content = content.rstrip() + '\n\n'
+            parts = [content.rstrip(), '']
             for label in sorted(references):
                 url, title = references[label]
                 if title:
-                    content += f'[{label}]: {url} "{title}"\n'
+                    parts.append(f'[{label}]: {url} "{title}"')
                 else:
-                    content += f'[{label}]: {url}\n'
+                    parts.append(f'[{label}]: {url}')
+            parts.append('')
+            content = '\n'.join(parts)
 
         return content
 
+    def _extract_references(self, content: str) -> Tuple[str, Dict[str, Tuple[str, str]]]:
+        """Remove reference definitions, returning them keyed by lowercase label."""
+        references = {}
+        def collect_reference(match):
+            label = match.group(1).lower()
+            url = match.group(2)
+            title = match.group(3) if match.group(3) else ''
+            references[label] = (url, title)
+            return ''
+
+        return _REFERENCE_DEF.sub(collect_reference, content), references
+
     def _process_images(self, content: str) -> str:
         """Process markdown images."""
         def process_image(match):
@@ -239,53 +443,48 @@ class MarkdownGenerator:
             return f'![{alt_text}]({src})'
 
         # Process inline images
-        return re.sub(r'!\[([^\]]+)\]\(([^)"]+)(?:\s+"([^"]+)")?\)',
-                     process_image, content)
+        return _IMAGE.sub(process_image, content)
 
     def _process_lists(self, content: str) -> str:
         """Process markdown lists."""
-        lines = content.split('\n')
-        processed_lines = []
-        list_indent = 0
-        list_type = None  # 'ul' or 'ol'
+        return '\n'.join(self._list_lines(content.split('\n')))
+
+    def _list_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        """Normalize list item markers."""
+        ul_match = _UL_ITEM.match
+        ol_match = _OL_ITEM.match
 
         for line in lines:
             stripped = line.lstrip()
-            indent = len(line) - len(stripped)
-            
-            # Detect list items
-            ul_match = re.match(r'^[-*+]\s', stripped)
-            ol_match = re.match(r'^\d+\.\s', stripped)
-
-            if ul_match or ol_match:
-                current_type = 'ul' if ul_match else 'ol'
-                
-                # Adjust indentation for nested lists
-                if list_type != current_type or indent != list_indent:
-                    list_type = current_type
-                    list_indent = indent
+            first = stripped[:1]
 
-                # Format list item
-                if list_type == 'ul':
+            # Format list items; the marker's first character rules out
+            # most lines before any regex runs
+            if first and first in '-*+':
+                if ul_match(stripped):
+                    indent = len(line) - len(stripped)
                     line = ' ' * indent + '- ' + stripped[2:].strip()
-                else:
-                    line = ' ' * indent + '1. ' + stripped[stripped.find(' '):].strip()
+            elif first.isdigit() and ol_match(stripped):
+                indent = len(line) - len(stripped)
+                line = ' ' * indent + '1. ' + stripped[stripped.find(' '):].strip()
 
-            processed_lines.append(line)
-
-        return '\n'.join(processed_lines)
+            yield line
 
     def _process_code_blocks(self, content: str) -> str:
         """Process markdown code blocks."""
-        lines = content.split('\n')
-        processed_lines = []
+        return '\n'.join(self._code_block_lines(content.split('\n')))
+
+    def _code_block_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        """Standardize code fences and convert indented code blocks."""
+        code_fence_match = _CODE_FENCE.match
         in_code_block = False
         code_fence = ''
 
         for line in lines:
-            # Check for code fence
-            fence_match = re.match(r'^(`{3,}|~{3,})', line)
-            
+            # Only lines opening with a fence can match the fence pattern
+            fence_match = code_fence_match(line) if line.startswith(('```', '~~~')) else None
+            indented = line.startswith('    ')
+
             if fence_match:
                 if not in_code_block:
                     # Start code block
@@ -300,49 +499,52 @@ class MarkdownGenerator:
                     line = '```'
 
             # Process indented code blocks
-            elif not in_code_block and line.startswith('    '):
+            elif indented and not in_code_block:
                 # Convert to fenced code block
-                processed_lines.append('```')
+                yield '```'
                 in_code_block = True
                 code_fence = 'indent'
                 line = line[4:]
 
             # End indented code block
-            elif in_code_block and code_fence == 'indent' and not line.startswith('    '):
+            elif not indented and code_fence == 'indent':
                 if line.strip():
-                    processed_lines.append('```')
+                    yield '```'
                     in_code_block = False
                     code_fence = ''
 
-            processed_lines.append(line)
+            yield line
 
         # Close any open code block
         if in_code_block:
-            processed_lines.append('```')
-
-        return '\n'.join(processed_lines)
+            yield '```'
 
     def _process_tables(self, content: str) -> str:
         """Process markdown tables."""
-        lines = content.split('\n')
-        processed_lines = []
+        return '\n'.join(self._table_lines(content.split('\n')))
+
+    def _table_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        """Align table columns to consistent widths."""
+        previous = None
+        pending = None
+        has_pending = False
         in_table = False
         column_widths = []
 
-        for i, line in enumerate(lines):
+        for raw_line in lines:
+            line = raw_line
             stripped = line.strip()
             
             # Detect table header separator
-            if re.match(r'^[|]?\s*[-:]+[-| :]+$', stripped):
-                if i > 0 and not in_table:
+            if _is_table_separator(stripped):
+                if has_pending and not in_table:
                     # Previous line was header
                     in_table = True
                     # Calculate column widths
-                    header = lines[i-1].strip()
-                    cells = [cell.strip() for cell in header.split('|')[1:-1]]
+                    cells = _split_table_row(previous.strip())
                     column_widths = [max(3, len(cell)) for cell in cells]
                     # Format header
-                    processed_lines[-1] = self._format_table_row(cells, column_widths)
+                    pending = self._format_table_row(cells, column_widths)
                     # Format separator
                     line = self._format_table_separator(column_widths)
             
@@ -351,12 +553,17 @@ class MarkdownGenerator:
                     in_table = False
                 else:
                     # Format table row
-                    cells = [cell.strip() for cell in stripped.split('|')[1:-1]]
+                    cells = _split_table_row(stripped)
                     line = self._format_table_row(cells, column_widths)
 
-            processed_lines.append(line)
+            if has_pending:
+                yield pending
+            pending = line
+            previous = raw_line
+            has_pending = True
 
-        return '\n'.join(processed_lines)
+        if has_pending:
+            yield pending
 
     def _format_table_row(self, cells: List[str], widths: List[int]) -> str:
         """Format table row with consistent column widths."""
@@ -372,14 +579,24 @@ class MarkdownGenerator:
                '|'.join(f"{'-' * (w-2)}:" for w in widths[1:]) + \
                f"|"
 
-    def _add_table_of_contents(self, content: str) -> str:
-        """Add table of contents to markdown content."""
+    def _add_table_of_contents(self, content: str,
+                               header_lines: Optional[List[str]] = None) -> str:
+        """Add table of contents to markdown content.
+
+        header_lines, when given, are the candidate header lines already
+        collected while processing, so the content is not scanned for them.
+        """
+        if '#' not in content:
+            return content
+
         headers = []
         lines = content.split('\n')
         
         # Extract headers
-        for line in lines:
-            header_match = re.match(r'^(#{1,6})\s+(.+?)(?:\s*#+\s*)?$', line)
+        for line in (lines if header_lines is None else header_lines):
+            if not 0 < _header_level(line) <= 6:
+                continue
+            header_match = _TOC_HEADER.match(line)
             if header_match:
                 level = len(header_match.group(1))
                 text = header_match.group(2).strip()
@@ -392,29 +609,46 @@ class MarkdownGenerator:
         toc = ["# Table of Contents\n"]
         for level, text in headers:
             # Create anchor link
-            anchor = text.lower().replace(' ', '-')
-            anchor = re.sub(r'[^\w\-]', '', anchor)
+            anchor = text.lower().translate(_ANCHOR_TABLE)
+            if not anchor.isascii():
+                anchor = _ANCHOR_INVALID.sub('', anchor)
             indent = '  ' * (level - 1)
             toc.append(f"{indent}- [{text}](#{anchor})")
 
         # Insert ToC after first header if exists
-        if lines and re.match(r'^#\s+', lines[0]):
-            return '\n'.join(lines[:1] + [''] + toc + [''] + lines[1:])
-        return '\n'.join(toc + [''] + lines)
+        toc.append('')
+        if lines and _header_level(lines[0]) == 1:
+            lines[1:1] = [''] + toc
+            return '\n'.join(lines)
+        toc.extend(lines)
+        return '\n'.join(toc)
 
     def _validate_structure(self, content: str) -> Dict[str, List[str]]:
         """Validate markdown structure."""
         errors = []
         warnings = []
 
-        # Check header hierarchy
+        lines = content.split('\n')
+        line_count = len(lines)
         headers = []
-        for line in content.split('\n'):
-            header_match = re.match(r'^(#{1,6})\s+', line)
-            if header_match:
-                level = len(header_match.group(1))
+        empty_sections = []
+        for i, line in enumerate(lines):
+            level = _header_level(line)
+            if not level:
+                continue
+
+            # Collect header hierarchy
+            if level <= 6:
                 headers.append(level)
 
+            # Check for empty sections
+            j = i + 1
+            while j < line_count and not lines[j].strip():
+                j += 1
+            if j == line_count or _header_level(lines[j]):
+                empty_sections.append(f"Empty section: {line.strip()}")
+
+        # Check header hierarchy
         if headers:
             if headers[0] != 1:
                 warnings.append("Document should start with an H1 header")
@@ -422,13 +656,7 @@ class MarkdownGenerator:
                 if headers[i] > headers[i-1] + 1:
                     errors.append(f"Header level jumps from H{headers[i-1]} to H{headers[i]}")
 
-        # Check for empty sections
-        lines = content.split('\n')
-        for i, line in enumerate(lines):
-            if re.match(r'^#+\s+', line):
-                next_content = next((l for l in lines[i+1:] if l.strip()), '')
-                if not next_content or re.match(r'^#+\s+', next_content):
-                    warnings.append(f"Empty section: {line.strip()}")
+        warnings.extend(empty_sections)
 
         return {
             'errors': errors,
@@ -440,39 +668,37 @@ class MarkdownGenerator:
         errors = []
         warnings = []
 
-        # Check inline links
-        inline_links = re.finditer(r'\[([^\]]+)\]\(([^)"]+)(?:\s+"[^"]+")?\)', content)
+        # Sweep inline links, reference definitions and reference uses together
+        refs = {}
+        used_labels = []
+        for match in _LINK_FORMS.finditer(content):
+            kind = match.lastgroup
 
-# generators/artifacts/markdown.py (continued)
-        for link in inline_links:
-            text = link.group(1)
-            url = link.group(2)
+            if kind == 'inline':
+                text = match.group('inline_text')
+                url = match.group('inline_url')
 
-            # Check for empty link text
-            if not text.strip():
-                errors.append(f"Empty link text for URL: {url}")
+                # Check for empty link text
+                if not text.strip():
+                    errors.append(f"Empty link text for URL: {url}")
 
-            # Check for malformed URLs
-            if ' ' in url and '%20' not in url:
-                errors.append(f"URL contains unescaped spaces: {url}")
+                # Check for malformed URLs
+                if ' ' in url and '%20' not in url:
+                    errors.append(f"URL contains unescaped spaces: {url}")
 
-            # Check for relative URLs
-            if not url.startswith(('http://', 'https://', '/', '#', 'mailto:')):
-                warnings.append(f"Relative URL used: {url}")
+                # Check for relative URLs
+                if not url.startswith(('http://', 'https://', '/', '#', 'mailto:')):
+                    warnings.append(f"Relative URL used: {url}")
 
-        # Check reference links
-        refs = {}
-        for match in re.finditer(r'^\[([^\]]+)\]:\s*(\S+)(?:\s+"[^"]+")?\s*$', content, re.MULTILINE):
-            label = match.group(1).lower()
-            url = match.group(2)
-            refs[label] = url
+            elif kind == 'refdef':
+                refs[match.group('def_label').lower()] = match.group('def_url')
 
-        # Check for undefined references
-        for match in re.finditer(r'\[([^\]]+)\]\[([^\]]*)\]', content):
-            text = match.group(1)
-            label = match.group(2) or text
-            label = label.lower()
-            
+            else:
+                label = match.group('use_label') or match.group('use_text')
+                used_labels.append(label.lower())
+
+        # Check for undefined references; definitions may follow their use
+        for label in used_labels:
             if label not in refs:
                 errors.append(f"Undefined reference: [{label}]")
 
@@ -487,7 +713,7 @@ class MarkdownGenerator:
         warnings = []
 
         # Check inline images
-        for match in re.finditer(r'!\[([^\]]*)\]\(([^)"]+)(?:\s+"[^"]+")?\)', content):
+        for match in _IMAGE_ANY_ALT.finditer(content):
             alt_text = match.group(1)
             src = match.group(2)
 
@@ -500,7 +726,8 @@ class MarkdownGenerator:
                 errors.append(f"Image URL contains unescaped spaces: {src}")
 
             # Check for supported file types
-            if not any(src.lower().endswith(ext) for ext in ['.png', '.jpg', '.jpeg', '.gif', '.svg']):
+            _, dot, extension = src.rpartition('.')
+            if not dot or extension.lower() not in _IMAGE_EXTENSIONS:
                 warnings.append(f"Possibly unsupported image type: {src}")
 
         return {
@@ -513,17 +740,15 @@ class MarkdownGenerator:
         errors = []
         warnings = []
 
-        # Check for consistent emphasis style
-        asterisk_emphasis = len(re.findall(r'\*[^\*]+\*', content))
-        underscore_emphasis = len(re.findall(r'_[^_]+_', content))
-        if asterisk_emphasis and underscore_emphasis:
-            warnings.append("Mixed emphasis styles used (* and _)")
+        # Check for consistent emphasis style; only presence matters, so stop
+        # at the first match of each style
+        if '*' in content and '_' in content:
+            if _EMPHASIS_ASTERISK.search(content) and _EMPHASIS_UNDERSCORE.search(content):
+                warnings.append("Mixed emphasis styles used (* and _)")
 
-        # Check for consistent strong emphasis style
-        asterisk_strong = len(re.findall(r'\*\*[^\*]+\*\*', content))
-        underscore_strong = len(re.findall(r'__[^_]+__', content))
-        if asterisk_strong and underscore_strong:
-            warnings.append("Mixed strong emphasis styles used (** and __)")
+            # Check for consistent strong emphasis style
+            if _STRONG_ASTERISK.search(content) and _STRONG_UNDERSCORE.search(content):
+                warnings.append("Mixed strong emphasis styles used (** and __)")
 
         # Check for proper list indentation
         lines = content.split('\n')
@@ -532,7 +757,7 @@ class MarkdownGenerator:
             stripped = line.lstrip()
             indent = len(line) - len(stripped)
             
-            if re.match(r'^[-*+]\s', stripped) or re.match(r'^\d+\.\s', stripped):
+            if _UL_ITEM.match(stripped) or _OL_ITEM.match(stripped):
                 if indent % 2 != 0:
                     errors.append(f"Improper list indentation at line {i+1}")
                 if indent - list_indent > 2:
@@ -547,7 +772,7 @@ class MarkdownGenerator:
                 if not in_code_block:
                     in_code_block = True
                     fence_char = line[0]
-                    if len(set(line)) > 1 and not re.match(r'^[`~]+\w+$', line):
+                    if len(set(line)) > 1 and not _FENCE_LANGUAGE.match(line):
                         warnings.append(f"Unclear code block language specification at line {i+1}")
                 else:
                     if line[0] != fence_char:
@@ -562,47 +787,108 @@ class MarkdownGenerator:
             'warnings': warnings
         }
 
-    def _generate_checksum(self, content: str) -> str:
-        """Generate checksum for content."""
-        import hashlib
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    def _generate_checksum(self, content: bytes) -> str:
+        """Generate checksum for UTF-8 encoded content."""
+        if self._use_blake3:
+            return blake3(content).hexdigest()
+        return hashlib.sha256(content).hexdigest()
 
     def cleanup_markdown(self, content: str) -> str:
         """Clean up markdown content."""
         # Remove multiple blank lines
-        content = re.sub(r'\n{3,}', '\n\n', content)
+        while '\n\n\n' in content:
+            content = content.replace('\n\n\n', '\n\n')
 
-        # Ensure single space after list markers
-        content = re.sub(r'^([-*+])\s+', r'\1 ', content, flags=re.MULTILINE)
-        content = re.sub(r'^(\d+\.)\s+', r'\1 ', content, flags=re.MULTILINE)
+        # Ensure single space after list markers and headers
+        content = '\n'.join(self._cleanup_lines(content.split('\n')))
 
         # Normalize emphasis markers
         if self.config.formatting_rules and 'emphasis_style' in self.config.formatting_rules:
             style = self.config.formatting_rules['emphasis_style']
-            if style == 'asterisk':
-                content = re.sub(r'_([^_]+)_', r'*\1*', content)
-            elif style == 'underscore':
-                content = re.sub(r'\*([^\*]+)\*', r'_\1_', content)
+            if style == 'asterisk' and '_' in content:
+                content = _EMPHASIS_UNDERSCORE.sub(r'*\1*', content)
+            elif style == 'underscore' and '*' in content:
+                content = _EMPHASIS_ASTERISK.sub(r'_\1_', content)
 
         # Normalize strong emphasis markers
         if self.config.formatting_rules and 'strong_emphasis_style' in self.config.formatting_rules:
             style = self.config.formatting_rules['strong_emphasis_style']
-            if style == 'asterisk':
-                content = re.sub(r'__([^_]+)__', r'**\1**', content)
-            elif style == 'underscore':
-                content = re.sub(r'\*\*([^\*]+)\*\*', r'__\1__', content)
-
-        # Ensure single space after headers
-        content = re.sub(r'^(#+)(\S)', r'\1 \2', content, flags=re.MULTILINE)
+            if style == 'asterisk' and '__' in content:
+                content = _STRONG_UNDERSCORE.sub(r'**\1**', content)
+            elif style == 'underscore' and '**' in content:
+                content = _STRONG_ASTERISK.sub(r'__\1__', content)
 
         # Clean up spaces around code spans
-        content = re.sub(r'\s*`([^`]+)`\s*', r' `\1` ', content)
+        if '`' in content:
+            content = _CODE_SPAN_SPACING.sub(r' `\1` ', content)
 
         # Normalize horizontal rules
-        content = re.sub(r'^[-*_]{3,}\s*$', '---', content, flags=re.MULTILINE)
+        if '-' in content or '*' in content or '_' in content:
+            content = _HORIZONTAL_RULE.sub('---', content)
 
         return content.strip() + '\n'
 
+    def _cleanup_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        """Clean up each line, joining a bare list marker to the next text.
+
+        The whitespace after a list marker may run across newlines, so a
+        marker alone on its line absorbs the blank lines after it and
+        "- \\n\\ntext" becomes "- text".
+        """
+        marker = ''
+        ordered = False
+        for line in lines:
+            if marker:
+                if not line.strip():
+                    continue
+                # Joined text no longer starts a line, so it gets no header
+                # spacing, and after an unordered marker no ordered-marker
+                # spacing either
+                first = line[0]
+                if first in '-*+' or (ordered and first.isdigit()):
+                    line = self._cleanup_line(line)
+            else:
+                line = self._cleanup_line(line)
+
+            if _is_bare_list_marker(line) and (not marker or ordered or not line[0].isdigit()):
+                marker += line.rstrip() + ' '
+                ordered = line[0].isdigit()
+                continue
+            if marker:
+                line = marker + line.lstrip()
+                marker = ''
+            yield line
+
+        if marker:
+            yield marker
+
+    def _cleanup_line(self, line: str) -> str:
+        """Normalize spacing after a line's list marker or header hashes."""
+        first = line[:1]
+        if not first:
+            return line
+
+        if first in '-*+':
+            # Unordered list marker followed by whitespace
+            if line[1:2].isspace():
+                return first + ' ' + line[1:].lstrip()
+            return line
+
+        if first == '#':
+            # Header hashes directly followed by text
+            level = len(line) - len(line.lstrip('#'))
+            if level < len(line) and not line[level].isspace():
+                return line[:level] + ' ' + line[level:]
+            return line
+
+        if first.isdigit():
+            # Ordered list marker followed by whitespace
+            digits = len(line) - len(line.lstrip('0123456789'))
+            if line[digits:digits + 1] == '.' and line[digits + 1:digits + 2].isspace():
+                return line[:digits + 1] + ' ' + line[digits + 1:].lstrip()
+
+        return line
+
     def format_markdown(self, content: str) -> str:
         """Format markdown content according to style guide."""
         if not self.config.style_guide:
@@ -613,10 +899,12 @@ class MarkdownGenerator:
         # Apply header style
         if 'header_style' in self.config.style_guide:
             style = self.config.style_guide['header_style']
-            if style == 'atx':
+            if style == 'atx' and ('=' in formatted or '-' in formatted):
                 # Convert Setext headers to ATX
                 lines = formatted.split('\n')
                 for i in range(1, len(lines)):
+                    if not lines[i]:
+                        continue
                     if lines[i].strip('=') == '':
                         lines[i-1] = f"# {lines[i-1]}"
                         lines[i] = ''
@@ -624,7 +912,7 @@ class MarkdownGenerator:
                         lines[i-1] = f"## {lines[i-1]}"
                         lines[i] = ''
                 formatted = '\n'.join(lines)
-            elif style == 'setext':
+            elif style == 'setext' and '#' in formatted:
                 # Convert ATX headers to Setext (only for h1 and h2)
                 lines = formatted.split('\n')
                 for i, line in enumerate(lines):
@@ -639,25 +927,16 @@ class MarkdownGenerator:
         # Apply list style
         if 'list_style' in self.config.style_guide:
             style = self.config.style_guide['list_style']
-            if style in ['-', '*', '+']:
+            if style in ['-', '*', '+'] and ('-' in formatted or '*' in formatted or '+' in formatted):
                 # Convert all unordered list markers to specified style
-                formatted = re.sub(r'^([ \t]*)[*+-]', rf'\1{style}', formatted, flags=re.MULTILINE)
+                formatted = _UL_MARKER.sub(rf'\1{style}', formatted)
 
         # Apply link style
         if 'link_style' in self.config.style_guide:
             style = self.config.style_guide['link_style']
-            if style == 'inline':
+            if style == 'inline' and '[' in formatted:
                 # Convert reference links to inline
-                references = {}
-                def collect_reference(match):
-                    label = match.group(1).lower()
-                    url = match.group(2)
-                    title = match.group(3) if match.group(3) else None
-                    references[label] = (url, title)
-                    return ''
-                
-                formatted = re.sub(r'^\[([^\]]+)\]:\s*(\S+)(?:\s+"([^"]+)")?\s*$',
-                                    collect_reference, formatted, flags=re.MULTILINE)
+                formatted, references = self._extract_references(formatted)
                 
                 def reference_to_inline(match):
                     text = match.group(1)
@@ -669,8 +948,7 @@ class MarkdownGenerator:
                         return f'[{text}]({url})'
                     return match.group(0)
                 
-                formatted = re.sub(r'\[([^\]]+)\](?:\[([^\]]*)\])',
-                                    reference_to_inline, formatted)
+                formatted = _REFERENCE_USE.sub(reference_to_inline, formatted)
 
         return formatted
 
@@ -679,28 +957,37 @@ class MarkdownGenerator:
         metadata = {}
 
         # Extract title
-        header_match = re.match(r'^#\s+(.+)$', content, re.MULTILINE)
+        header_match = _TITLE.match(content)
         if header_match:
             metadata['title'] = header_match.group(1).strip()
 
-        # Extract tags
-        tag_matches = re.finditer(r'#(\w+)', content)
-        metadata['tags'] = [m.group(1) for m in tag_matches]
-
-        # Extract links
-        link_matches = re.finditer(r'\[([^\]]+)\]\(([^)]+)\)', content)
-        metadata['links'] = [{'text': m.group(1), 'url': m.group(2)} 
-                            for m in link_matches]
-
-        # Extract code block languages
-        code_blocks = re.finditer(r'```(\w+)', content)
-        metadata['languages'] = list(set(m.group(1) for m in code_blocks if m.group(1)))
-
-        # Count sections
+        # Collect tags, code block languages and section counts in one line pass
+        tags = []
+        languages = set()
         header_levels = {}
-        for match in re.finditer(r'^(#{1,6})\s', content, re.MULTILINE):
-            level = len(match.group(1))
-            header_levels[level] = header_levels.get(level, 0) + 1
+        lines = content.split('\n')
+        last = len(lines) - 1
+        for index, line in enumerate(lines):
+            if '#' in line:
+                level = _header_level(line)
+                # A bare '###' is still a section when a newline follows it
+                if not level and index < last and not line.strip('#'):
+                    level = len(line)
+                if 0 < level <= 6:
+                    header_levels[level] = header_levels.get(level, 0) + 1
+                tags.extend(_TAG.findall(line))
+            if '```' in line:
+                languages.update(_FENCE_LANGUAGE_TAG.findall(line))
+        metadata['tags'] = tags
+
+        # Extract links; a link may wrap across lines, so scan the whole text
+        if '](' in content:
+            metadata['links'] = [{'text': m.group(1), 'url': m.group(2)}
+                                 for m in _LINK.finditer(content)]
+        else:
+            metadata['links'] = []
+
+        metadata['languages'] = list(languages)
         metadata['section_counts'] = header_levels
 
         return metadata
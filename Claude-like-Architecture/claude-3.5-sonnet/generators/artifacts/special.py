@@ -1,9 +1,13 @@
 # generators/artifacts/special.py
 
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, Tuple
+from collections import OrderedDict
+from functools import lru_cache
 from dataclasses import dataclass
 from datetime import datetime
 from uuid import UUID
+import hashlib
+import io
 import re
 import json
 import logging
@@ -16,6 +20,150 @@ from models.artifacts import (
     ValidationResult
 )
 
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+if lxml_etree is not None:
+    _XML_PARSE_ERRORS = (ET.ParseError, lxml_etree.XMLSyntaxError)
+else:
+    _XML_PARSE_ERRORS = (ET.ParseError,)
+
+# Formatting and optimization patterns
+_WHITESPACE = re.compile(r'\s+')
+_VIEWBOX = re.compile(r'viewBox=["\']([0-9\s.-]+)["\']')
+_SIZE_ATTR = re.compile(r'\s(width|height)=["\'][0-9]+["\']')
+_CLASS_NAME = re.compile(r'className=["\'](.*?)["\']')
+_SVG_COMMENT = re.compile(r'<!--.*?-->', re.DOTALL)
+_LONG_DECIMAL = re.compile(r'(\d+\.\d{2})\d+')
+_EMPTY_GROUP = re.compile(r'<g[^>]*>\s*</g>')
+_PATH_DATA = re.compile(r'd="([^"]+)"')
+_REACT_NAMED_IMPORT = re.compile(r'import {([^}]+)} from \'react\';')
+
+# Validation patterns
+_UNSAFE_CONTENT = re.compile(
+    r'(?P<script><script)|(?P<javascript>javascript:)|(?P<data>data:)|(?P<xlink>xlink:href)',
+    re.IGNORECASE
+)
+_UNSAFE_LABELS = {
+    'script': '<script',
+    'javascript': 'javascript:',
+    'data': 'data:',
+    'xlink': 'xlink:href'
+}
+_MERMAID_ARROW = re.compile(r'[\w\s]-->[\w\s]')
+_MERMAID_DIAGRAM_STARTS = (
+    'graph ', 'sequenceDiagram', 'classDiagram',
+    'stateDiagram', 'erDiagram', 'gantt', 'pie', 'flowchart '
+)
+_ARBITRARY_TAILWIND = re.compile(r'className=["\'][^"\']*\[.*?\][^"\']*["\']')
+_HOOKS_IMPORT = re.compile(r'import\s+{\s*useState\s*,\s*useEffect\s*}\s+from\s+[\'"]react[\'"]')
+_INTERACTIVE_ELEMENT = re.compile(r'<(button|a|input|select|textarea)\b([^>]*)>')
+
+# Accessibility patterns
+_SVG_INTERACTIVE = re.compile(r'<(a|button)[^>]*>', re.IGNORECASE)
+_ARIA_LABEL = re.compile(r'aria-label=["\']([^"\']+)["\']', re.IGNORECASE)
+_DIV_TAG = re.compile(r'<div[^>]*>')
+_SEMANTIC_TAG = re.compile(r'<(header|footer|main|nav|section|article|aside)>')
+_IMG_TAG = re.compile(r'<img[^>]+>', re.IGNORECASE)
+_ALT_ATTR = re.compile(r'alt=["\']([^"\']+)["\']', re.IGNORECASE)
+_BUTTON_TAG = re.compile(r'<button[^>]+>', re.IGNORECASE)
+
+# Prebuilt indentation for the line formatters
+_MERMAID_INDENTS = tuple('    ' * level for level in range(32))
+_REACT_INDENTS = tuple('  ' * level for level in range(64))
+
+def _indentation(indents: Tuple[str, ...], level: int) -> str:
+    """Return the indentation for a nesting level, building it past the table."""
+    if level < len(indents):
+        return indents[level]
+    return indents[1] * level
+
+def _parse_svg_root(content: str):
+    """Parse SVG markup and return its root element, using lxml when installed."""
+    if lxml_etree is not None:
+        # Parsers are not shared between threads; entities stay unresolved
+        parser = lxml_etree.XMLParser(resolve_entities=False, no_network=True)
+        return lxml_etree.fromstring(content.encode('utf-8'), parser)
+    return ET.fromstring(content)
+
+_CONSOLE_CALL = 'console.log('
+
+def _console_call_end(content: str, start: int) -> int:
+    """Return the index just past the call's closing parenthesis, or -1 if unbalanced."""
+    depth = 1
+    quote = None
+    index = start
+    length = len(content)
+    while index < length:
+        char = content[index]
+        if quote:
+            if char == '\\':
+                index += 1
+            elif char == quote:
+                quote = None
+        elif char in '"\'`':
+            quote = char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return index + 1
+        index += 1
+    return -1
+
+def _strip_console_logs(content: str) -> str:
+    """Remove console.log(...) statements, including nested calls and string arguments.
+
+    Indentation before the call and a trailing semicolon and newline go with it.
+    """
+    if _CONSOLE_CALL not in content:
+        return content
+
+    buffer = io.StringIO()
+    position = 0
+    search_from = 0
+    while True:
+        start = content.find(_CONSOLE_CALL, search_from)
+        if start == -1:
+            break
+        search_from = start + len(_CONSOLE_CALL)
+        if start and (content[start - 1].isalnum() or content[start - 1] in '_$.'):
+            continue
+        end = _console_call_end(content, search_from)
+        if end == -1:
+            break
+
+        # Drop indentation before the call and a trailing ';' and newline
+        line_start = start
+        while line_start > position and content[line_start - 1] in ' \t':
+            line_start -= 1
+        if content.startswith(';', end):
+            end += 1
+        if content.startswith('\n', end):
+            end += 1
+
+        buffer.write(content[position:line_start])
+        position = search_from = end
+
+    buffer.write(content[position:])
+    return buffer.getvalue()
+
+@lru_cache(maxsize=1024)
+def _sorted_class_name(classes: str) -> str:
+    """Return a className attribute with its classes sorted alphabetically."""
+    return f'className="{" ".join(sorted(classes.split()))}"'
+
+class _FormattedJSON(str):
+    """JSON text already serialized with the chart formatter's layout."""
+
 @dataclass
 class SpecialGenerationConfig:
     """Configuration for special artifacts generation."""
@@ -25,6 +173,7 @@ class SpecialGenerationConfig:
     validation_rules: Optional[Dict[str, Any]] = None
     custom_settings: Optional[Dict[str, Any]] = None
     help_url: Optional[str] = None
+    checksum_algorithm: str = "sha256"  # or "xxh64" when the package is installed
 
 @dataclass
 class SpecialArtifact:
@@ -37,14 +186,27 @@ class SpecialArtifact:
 class SpecialArtifactGenerator:
     """Generates special artifacts like SVG, Mermaid diagrams, React components, and charts."""
 
+    RESULT_CACHE_SIZE = 64
+
     def __init__(self, config: Optional[SpecialGenerationConfig] = None):
         self.config = config or SpecialGenerationConfig(type=ArtifactType.SVG)
         self.generators: Dict[ArtifactType, callable] = {}
         self.validators: Dict[ArtifactType, callable] = {}
         self.formatters: Dict[ArtifactType, callable] = {}
         self.optimizers: Dict[ArtifactType, callable] = {}
+        self._use_xxhash = self.config.checksum_algorithm == "xxh64" and xxhash is not None
+        self._result_cache: OrderedDict = OrderedDict()
+        self._svg_dispatch: Dict[str, callable] = {
+            'rect': self._generate_svg_rect,
+            'circle': self._generate_svg_circle,
+            'path': self._generate_svg_path,
+            'text': self._generate_svg_text
+        }
+        self._mermaid_dispatch: Dict[str, callable] = {
+            'node': self._generate_mermaid_node,
+            'connection': self._generate_mermaid_connection
+        }
         self._initialize_processors()
-        logging.basicConfig(level=logging.DEBUG)
         self.logger = logging.getLogger(__name__)
 
     def generate_artifact(self,
@@ -52,10 +214,16 @@ class SpecialArtifactGenerator:
                         identifier: str,
                         title: str,
                         artifact_type: ArtifactType,
-                        metadata: Optional[Dict[str, Any]] = None) -> Artifact:
-        """Generate a special artifact."""
+                        metadata: Optional[Dict[str, Any]] = None,
+                        content_hash: Optional[str] = None) -> Artifact:
+        """Generate a special artifact.
+
+        content_hash, when given, stands in for the content when looking up
+        previously generated results.
+        """
+        at_value = getattr(artifact_type, 'value', artifact_type)
         try:
-            self.logger.debug(f"Starting generation of {artifact_type.value} artifact.")
+            self.logger.debug("Starting generation of %s artifact.", at_value)
             
             # Validate inputs
             if not content:
@@ -77,48 +245,30 @@ class SpecialArtifactGenerator:
                 raise ArtifactError("Metadata must be a dictionary")
 
             # Validate artifact type
-            if artifact_type not in self.generators:
-                raise ArtifactError(f"No generator found for type: {artifact_type.value}")
-
-            # Generate artifact content
-            try:
-                generator = self.generators[artifact_type]
-                generated_content = generator(content, self.config.custom_settings or {})
-                self.logger.debug(f"Generated content for {artifact_type.value}")
-            except Exception as e:
-                raise ArtifactError(f"Content generation failed: {str(e)}")
+            generator = self.generators.get(artifact_type)
+            if generator is None:
+                raise ArtifactError(f"No generator found for type: {at_value}")
 
-            # Validate artifact content
-            validator = self.validators.get(artifact_type)
-            if validator:
-                validation_result = validator(generated_content)
-                if not validation_result.valid:
-                    self.logger.error(f"Validation failed for {artifact_type.value}: {validation_result.errors}")
-                    raise ArtifactError(
-                        f"Generated {artifact_type.value} artifact validation failed: {', '.join(validation_result.errors)}"
-                    )
-                if validation_result.warnings:
-                    self.logger.warning(f"Validation warnings for {artifact_type.value}: {validation_result.warnings}")
-            else:
-                validation_result = ValidationResult(valid=True, errors=[], warnings=[])
-
-            # Format and optimize content
-            try:
-                formatted_content = self._format_content(generated_content, artifact_type)
-                optimized_content = self._optimize_content(formatted_content, artifact_type)
-            except Exception as e:
-                raise ArtifactError(f"Content processing failed: {str(e)}")
+            optimized_content, validation_result = self._build_content(
+                content, artifact_type, generator, content_hash
+            )
 
             # Create metadata
             try:
+                custom_data = metadata or {}
+                if self._use_xxhash:
+                    custom_data = {**custom_data, 'checksum_algorithm': 'xxh64'}
+                # Encode once for both size and checksum
+                encoded_content = optimized_content.encode('utf-8')
+                now = datetime.now()
                 artifact_metadata = ArtifactMetadata(
-                    created_at=datetime.now(),
-                    modified_at=datetime.now(),
+                    created_at=now,
+                    modified_at=now,
                     version="1.0.0",
                     creator="SpecialArtifactGenerator",
-                    size=len(optimized_content.encode('utf-8')),
-                    checksum=self._generate_checksum(optimized_content),
-                    custom_data=metadata or {}
+                    size=len(encoded_content),
+                    checksum=self._generate_checksum(encoded_content),
+                    custom_data=custom_data
                 )
             except Exception as e:
                 raise ArtifactError(f"Failed to create artifact metadata: {str(e)}")
@@ -133,18 +283,83 @@ class SpecialArtifactGenerator:
                 validation=validation_result
             )
 
-            self.logger.info(f"Successfully generated {artifact_type.value} artifact with ID: {identifier}")
+            self.logger.info(f"Successfully generated {at_value} artifact with ID: {identifier}")
             return artifact
 
         except ArtifactError:
             raise
         except Exception as e:
             self.logger.error(f"Artifact generation failed: {str(e)}")
-            raise ArtifactError(f"Failed to generate {artifact_type.value} artifact: {str(e)}")
+            raise ArtifactError(f"Failed to generate {at_value} artifact: {str(e)}")
+
+    def _build_content(self,
+                       content: Dict[str, Any],
+                       artifact_type: ArtifactType,
+                       generator: callable,
+                       content_hash: Optional[str] = None) -> Tuple[str, ValidationResult]:
+        """Generate, validate, format and optimize content, reusing results for repeated input."""
+        at_value = artifact_type.value
+        settings = self.config.custom_settings or {}
+        cache_key = self._result_cache_key(artifact_type, content, settings, content_hash)
+        cached = self._result_cache.get(cache_key) if cache_key is not None else None
+        if cached is not None:
+            self._result_cache.move_to_end(cache_key)
+            optimized_content, validation_result = cached
+        else:
+            # Generate artifact content
+            try:
+                generated_content = generator(content, settings)
+                self.logger.debug("Generated content for %s", at_value)
+            except Exception as e:
+                raise ArtifactError(f"Content generation failed: {str(e)}")
 
-        except Exception as e:
-            self.logger.error(f"Artifact generation failed: {str(e)}")
-            raise ArtifactError(f"Failed to generate {artifact_type.value} artifact: {str(e)}")
+            # Validate artifact content
+            validator = self.validators.get(artifact_type)
+            if validator:
+                validation_result = validator(generated_content)
+                if not validation_result.valid:
+                    self.logger.error(f"Validation failed for {at_value}: {validation_result.errors}")
+                    raise ArtifactError(
+                        f"Generated {at_value} artifact validation failed: {', '.join(validation_result.errors)}"
+                    )
+                if validation_result.warnings:
+                    self.logger.warning(f"Validation warnings for {at_value}: {validation_result.warnings}")
+            else:
+                validation_result = ValidationResult(valid=True, errors=[], warnings=[])
+
+            # Format and optimize content
+            try:
+                formatter = self.formatters.get(artifact_type)
+                formatted_content = formatter(generated_content) if formatter else generated_content
+                optimizer = self.optimizers.get(artifact_type)
+                optimized_content = optimizer(formatted_content) if optimizer else formatted_content
+            except Exception as e:
+                raise ArtifactError(f"Content processing failed: {str(e)}")
+
+            if cache_key is not None:
+                self._result_cache[cache_key] = (optimized_content, validation_result)
+                if len(self._result_cache) > self.RESULT_CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
+
+        # Hand out a copy so artifacts never share mutable result lists
+        return optimized_content, ValidationResult(
+            valid=validation_result.valid,
+            errors=list(validation_result.errors),
+            warnings=list(validation_result.warnings)
+        )
+
+    def _result_cache_key(self,
+                          artifact_type: ArtifactType,
+                          content: Dict[str, Any],
+                          settings: Dict[str, Any],
+                          content_hash: Optional[str] = None) -> Optional[Tuple[ArtifactType, str, str]]:
+        """Build a result cache key, or None when the input cannot be serialized."""
+        try:
+            content_key = content_hash or json.dumps(content, sort_keys=True)
+            settings_key = json.dumps(settings, sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+        return (artifact_type, content_key, settings_key)
 
     def _initialize_processors(self) -> None:
         """Initialize processors for different artifact types."""
@@ -195,24 +410,19 @@ class SpecialArtifactGenerator:
             viewbox = content.get('viewBox', '0 0 100 100')
             
             # Build SVG structure
-            svg_lines = [
-                f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{viewbox}">'
-            ]
+            buffer = io.StringIO()
+            buffer.write(f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{viewbox}">')
             
             # Add elements
+            dispatch = self._svg_dispatch
             for element in elements:
-                if element['type'] == 'rect':
-                    svg_lines.append(self._generate_svg_rect(element))
-                elif element['type'] == 'circle':
-                    svg_lines.append(self._generate_svg_circle(element))
-                elif element['type'] == 'path':
-                    svg_lines.append(self._generate_svg_path(element))
-                elif element['type'] == 'text':
-                    svg_lines.append(self._generate_svg_text(element))
+                generate = dispatch.get(element['type'])
+                if generate:
+                    buffer.write('\n' + generate(element))
                     
-            svg_lines.append('</svg>')
+            buffer.write('\n</svg>')
             
-            return '\n'.join(svg_lines)
+            return buffer.getvalue()
 
         except Exception as e:
             self.logger.error(f"SVG generation failed: {str(e)}")
@@ -228,16 +438,17 @@ class SpecialArtifactGenerator:
             elements = content.get('elements', [])
             
             # Start diagram
-            diagram_lines = [f"{diagram_type} TD"]
+            buffer = io.StringIO()
+            buffer.write(f"{diagram_type} TD")
             
             # Add elements
+            dispatch = self._mermaid_dispatch
             for element in elements:
-                if element.get('type') == 'node':
-                    diagram_lines.append(self._generate_mermaid_node(element))
-                elif element.get('type') == 'connection':
-                    diagram_lines.append(self._generate_mermaid_connection(element))
+                generate = dispatch.get(element.get('type'))
+                if generate:
+                    buffer.write('\n' + generate(element))
                     
-            return '\n'.join(diagram_lines)
+            return buffer.getvalue()
 
         except Exception as e:
             self.logger.error(f"Mermaid generation failed: {str(e)}")
@@ -255,27 +466,27 @@ class SpecialArtifactGenerator:
             elements = content.get('elements', [])
             
             # Build component
-            component_lines = [
-                'import React from "react";',
-                '',
-                f'export default function {name}({self._format_props(props)}) {{',
-                '  return (',
-                '    <div className="container">'
-            ]
+            buffer = io.StringIO()
+            buffer.write(
+                'import React from "react";\n'
+                '\n'
+                f'export default function {name}({self._format_props(props)}) {{\n'
+                '  return (\n'
+                '    <div className="container">\n'
+            )
             
             # Add elements
             for element in elements:
-                component_lines.extend(
-                    self._generate_react_element(element, indent=6)
-                )
+                for line in self._generate_react_element(element, indent=6):
+                    buffer.write(line + '\n')
                 
-            component_lines.extend([
-                '    </div>',
-                '  );',
+            buffer.write(
+                '    </div>\n'
+                '  );\n'
                 '}'
-            ])
+            )
             
-            return '\n'.join(component_lines)
+            return buffer.getvalue()
 
         except Exception as e:
             self.logger.error(f"React component generation failed: {str(e)}")
@@ -291,20 +502,30 @@ class SpecialArtifactGenerator:
             data = content.get('data', [])
             config = content.get('config', {})
             
+            # Collect labels and values in one pass over the data
+            labels = []
+            values = []
+            add_label = labels.append
+            add_value = values.append
+            for item in data:
+                get = item.get
+                add_label(get('label'))
+                add_value(get('value'))
+            
             # Generate chart configuration
             chart_config = {
                 'type': chart_type,
                 'data': {
-                    'labels': [item.get('label') for item in data],
+                    'labels': labels,
                     'datasets': [{
-                        'data': [item.get('value') for item in data],
+                        'data': values,
                         **config
                     }]
                 },
                 'options': settings
             }
             
-            return json.dumps(chart_config, indent=2)
+            return _FormattedJSON(json.dumps(chart_config, indent=2))
 
         except Exception as e:
             self.logger.error(f"Chart generation failed: {str(e)}")
@@ -321,10 +542,10 @@ class SpecialArtifactGenerator:
             'y': element.get('y', 0),
             'width': element.get('width', 10),
             'height': element.get('height', 10),
-            'fill': element.get('fill', 'black'),
-            **element.get('attributes', {})
+            'fill': element.get('fill', 'black')
         }
-        return f'<rect {self._format_attributes(attrs)}/>'
+        attributes = self._format_attributes(attrs, element.get('attributes'))
+        return f'<rect {attributes}/>'
 
     def _generate_svg_circle(self, element: Dict[str, Any]) -> str:
         """Generate SVG circle element."""
@@ -332,30 +553,30 @@ class SpecialArtifactGenerator:
             'cx': element.get('cx', 0),
             'cy': element.get('cy', 0),
             'r': element.get('r', 5),
-            'fill': element.get('fill', 'black'),
-            **element.get('attributes', {})
+            'fill': element.get('fill', 'black')
         }
-        return f'<circle {self._format_attributes(attrs)}/>'
+        attributes = self._format_attributes(attrs, element.get('attributes'))
+        return f'<circle {attributes}/>'
 
     def _generate_svg_path(self, element: Dict[str, Any]) -> str:
         """Generate SVG path element."""
         attrs = {
             'd': element.get('d', ''),
             'stroke': element.get('stroke', 'black'),
-            'fill': element.get('fill', 'none'),
-            **element.get('attributes', {})
+            'fill': element.get('fill', 'none')
         }
-        return f'<path {self._format_attributes(attrs)}/>'
+        attributes = self._format_attributes(attrs, element.get('attributes'))
+        return f'<path {attributes}/>'
 
     def _generate_svg_text(self, element: Dict[str, Any]) -> str:
         """Generate SVG text element."""
         attrs = {
             'x': element.get('x', 0),
             'y': element.get('y', 0),
-            'font-size': element.get('fontSize', 12),
-            **element.get('attributes', {})
+            'font-size': element.get('fontSize', 12)
         }
-        return f'<text {self._format_attributes(attrs)}>{element.get("text", "")}</text>'
+        attributes = self._format_attributes(attrs, element.get('attributes'))
+        return f'<text {attributes}>{element.get("text", "")}</text>'
 
     # =====================
     # Mermaid Generators
@@ -390,32 +611,38 @@ class SpecialArtifactGenerator:
                                 element: Dict[str, Any],
                                 indent: int = 0) -> List[str]:
         """Generate React element."""
-        tag = element.get('tag', 'div')
-        className = element.get('className', '')
-        children = element.get('children', [])
-        props = element.get('props', {})
-        
         lines = []
-        spaces = ' ' * indent
+        # Entries are either element dicts with their indent or finished lines
+        stack = [(element, indent)]
         
-        # Opening tag with props
-        props_str = self._format_props_dict(props)
-        if className:
-            props_str = f'className="{className}" ' + props_str
-        if props_str:
-            lines.append(f'{spaces}<{tag} {props_str}>')
-        else:
-            lines.append(f'{spaces}<{tag}>')
+        while stack:
+            node, level = stack.pop()
+            if isinstance(node, str):
+                lines.append(node)
+                continue
             
-        # Children
-        for child in children:
-            if isinstance(child, str):
-                lines.append(f'{spaces}  {child}')
-            elif isinstance(child, dict):
-                lines.extend(self._generate_react_element(child, indent + 2))
-                
-        # Closing tag
-        lines.append(f'{spaces}</{tag}>')
+            tag = node.get('tag', 'div')
+            className = node.get('className', '')
+            children = node.get('children', [])
+            props = node.get('props', {})
+            spaces = ' ' * level
+            
+            # Opening tag with props
+            props_str = self._format_props_dict(props)
+            if className:
+                props_str = f'className="{className}" ' + props_str
+            if props_str:
+                lines.append(f'{spaces}<{tag} {props_str}>')
+            else:
+                lines.append(f'{spaces}<{tag}>')
+            
+            # Closing tag, then children on top of it in reverse so they pop in order
+            stack.append((f'{spaces}</{tag}>', level))
+            for child in reversed(children):
+                if isinstance(child, str):
+                    stack.append((f'{spaces}  {child}', level))
+                elif isinstance(child, dict):
+                    stack.append((child, level + 2))
         
         return lines
 
@@ -434,18 +661,18 @@ class SpecialArtifactGenerator:
         self.logger.debug("Formatting SVG content.")
         try:
             # Remove unnecessary whitespace
-            content = re.sub(r'\s+', ' ', content)
-            content = re.sub(r'>\s+<', '><', content)
+            content = ' '.join(content.split())
+            content = content.replace('> <', '><')
             
             # Format viewBox if present
-            viewbox_match = re.search(r'viewBox=["\']([0-9\s.-]+)["\']', content)
+            viewbox_match = _VIEWBOX.search(content)
             if viewbox_match:
                 values = viewbox_match.group(1).split()
                 formatted_viewbox = f'viewBox="{" ".join(values)}"'
-                content = re.sub(r'viewBox=["\'"][0-9\s.-]+["\']', formatted_viewbox, content)
+                content = _VIEWBOX.sub(formatted_viewbox, content)
 
             # Remove width/height attributes if present
-            content = re.sub(r'\s(width|height)=["\'][0-9]+["\']', '', content)
+            content = _SIZE_ATTR.sub('', content)
 
             return content.strip()
         except Exception as e:
@@ -457,21 +684,18 @@ class SpecialArtifactGenerator:
         self.logger.debug("Formatting Mermaid diagram.")
         try:
             lines = content.strip().split('\n')
-            formatted_lines = []
+            formatted_lines = [None] * len(lines)
             indent_level = 0
 
-            for line in lines:
+            for index, line in enumerate(lines):
                 stripped = line.strip()
                 
                 # Adjust indent for subgraphs
+                if stripped == 'end':
+                    indent_level = max(0, indent_level - 1)
+                formatted_lines[index] = _indentation(_MERMAID_INDENTS, indent_level) + stripped
                 if stripped.startswith('subgraph'):
-                    formatted_lines.append('    ' * indent_level + stripped)
                     indent_level += 1
-                elif stripped == 'end':
-                    indent_level = max(0, indent_level - 1)
-                    formatted_lines.append('    ' * indent_level + stripped)
-                else:
-                    formatted_lines.append('    ' * indent_level + stripped)
 
             return '\n'.join(formatted_lines)
         except Exception as e:
@@ -484,21 +708,19 @@ class SpecialArtifactGenerator:
         try:
             # Basic formatting with indentation
             lines = content.strip().split('\n')
-            formatted_lines = []
+            formatted_lines = [None] * len(lines)
             indent_level = 0
 
-            for line in lines:
+            for index, line in enumerate(lines):
                 stripped = line.strip()
                 
                 # Adjust indent for blocks
-                if stripped.endswith('{') or stripped.endswith('('):
-                    formatted_lines.append('  ' * indent_level + stripped)
-                    indent_level += 1
-                elif stripped.startswith('}'):
+                opens_block = stripped.endswith(('{', '('))
+                if not opens_block and stripped.startswith('}'):
                     indent_level = max(0, indent_level - 1)
-                    formatted_lines.append('  ' * indent_level + stripped)
-                else:
-                    formatted_lines.append('  ' * indent_level + stripped)
+                formatted_lines[index] = _indentation(_REACT_INDENTS, indent_level) + stripped
+                if opens_block:
+                    indent_level += 1
 
             content = '\n'.join(formatted_lines)
 
@@ -515,6 +737,8 @@ class SpecialArtifactGenerator:
         self.logger.debug("Formatting chart configuration.")
         try:
             # Pretty-print JSON if necessary
+            if isinstance(content, _FormattedJSON):
+                return content
             return json.dumps(json.loads(content), indent=2)
         except json.JSONDecodeError as e:
             self.logger.error(f"Chart formatting failed: {str(e)}")
@@ -526,15 +750,10 @@ class SpecialArtifactGenerator:
         self.logger.debug("Formatting JSX className attributes.")
         try:
             def sort_classnames(match):
-                classes = match.group(1).split()
-                sorted_classes = ' '.join(sorted(classes))
-                return f'className="{sorted_classes}"'
-
-            content = re.sub(
-                r'className=["\'](.*?)["\']',
-                sort_classnames,
-                content
-            )
+                # Utility class lists repeat across elements, so results are cached
+                return _sorted_class_name(match.group(1))
+
+            content = _CLASS_NAME.sub(sort_classnames, content)
             return content
         except Exception as e:
             self.logger.error(f"JSX formatting failed: {str(e)}")
@@ -558,7 +777,7 @@ class SpecialArtifactGenerator:
         warnings = []
 
         try:
-            root = ET.fromstring(content)
+            root = _parse_svg_root(content)
             if root.tag != 'svg':
                 errors.append("Content must start with <svg> tag.")
 
@@ -571,17 +790,17 @@ class SpecialArtifactGenerator:
                 warnings.append("SVG should use viewBox instead of width/height attributes.")
 
             # Check for unsafe content
-            unsafe_patterns = [
-                r'<script',
-                r'javascript:',
-                r'data:',
-                r'xlink:href'
-            ]
-            for pattern in unsafe_patterns:
-                if re.search(pattern, content, re.IGNORECASE):
-                    errors.append(f"SVG contains potentially unsafe content: {pattern}")
-
-        except ET.ParseError as e:
+            found = set()
+            for match in _UNSAFE_CONTENT.finditer(content):
+                found.add(match.lastgroup)
+                if len(found) == len(_UNSAFE_LABELS):
+                    break
+            errors.extend(
+                f"SVG contains potentially unsafe content: {label}"
+                for name, label in _UNSAFE_LABELS.items() if name in found
+            )
+
+        except _XML_PARSE_ERRORS as e:
             errors.append(f"Invalid SVG syntax: {str(e)}")
 
         return ValidationResult(
@@ -597,19 +816,16 @@ class SpecialArtifactGenerator:
         warnings = []
 
         try:
-            if not content.strip():
+            stripped = content.strip()
+            if not stripped:
                 errors.append("Mermaid content cannot be empty.")
 
             # Check for valid diagram type
-            valid_starts = [
-                'graph ', 'sequenceDiagram', 'classDiagram',
-                'stateDiagram', 'erDiagram', 'gantt', 'pie', 'flowchart '
-            ]
-            if not any(content.strip().startswith(start) for start in valid_starts):
+            if not stripped.startswith(_MERMAID_DIAGRAM_STARTS):
                 errors.append("Invalid Mermaid diagram type.")
 
             # Check for common syntax issues
-            if '-->' in content and not re.search(r'[\w\s]-->[\w\s]', content):
+            if '-->' in content and not _MERMAID_ARROW.search(content):
                 warnings.append("Possible syntax error in arrow notation.")
 
             if '==>' in content:
@@ -640,7 +856,7 @@ class SpecialArtifactGenerator:
                 errors.append("React component must have a default export.")
 
             # Check for invalid Tailwind classes
-            if re.search(r'className=["\'][^"\']*\[.*?\][^"\']*["\']', content):
+            if _ARBITRARY_TAILWIND.search(content):
                 errors.append("Arbitrary Tailwind values are not allowed.")
 
             # Check for props validation
@@ -649,13 +865,15 @@ class SpecialArtifactGenerator:
 
             # Check for hooks usage
             if "useState" in content or "useEffect" in content:
-                if not re.search(r'import\s+{\s*useState\s*,\s*useEffect\s*}\s+from\s+[\'"]react[\'"]', content):
+                if not _HOOKS_IMPORT.search(content):
                     warnings.append("Hooks should be imported from 'react'.")
 
             # Check for accessibility
-            interactive_elements = re.findall(r'<(button|a|input|select|textarea)[^>]*>', content)
-            for element in interactive_elements:
-                if not re.search(r'aria-[\w-]+="[^"]+"', element):
+            flagged = set()
+            for match in _INTERACTIVE_ELEMENT.finditer(content):
+                element, attributes = match.groups()
+                if 'aria-' not in attributes and element not in flagged:
+                    flagged.add(element)
                     warnings.append(f"Consider adding ARIA attributes to <{element}> for accessibility.")
 
         except Exception as e:
@@ -700,19 +918,25 @@ class SpecialArtifactGenerator:
         self.logger.debug("Optimizing SVG content.")
         try:
             # Remove comments
-            content = re.sub(r'<!--.*?-->', '', content, flags=re.DOTALL)
+            if '<!--' in content:
+                content = _SVG_COMMENT.sub('', content)
             
             # Optimize numbers
-            content = re.sub(r'(\d+\.\d{2})\d+', r'\1', content)
+            if '.' in content:
+                content = _LONG_DECIMAL.sub(r'\1', content)
             
-            # Remove empty groups
-            content = re.sub(r'<g[^>]*>\s*</g>', '', content)
+            # Remove empty groups, repeating until nested empty groups are gone
+            if '<g' in content:
+                removed = 1
+                while removed:
+                    content, removed = _EMPTY_GROUP.subn('', content)
             
             # Remove unnecessary spaces in path data
             def optimize_path(match):
-                return 'd="' + re.sub(r'\s+', ' ', match.group(1).strip()) + '"'
+                return 'd="' + _WHITESPACE.sub(' ', match.group(1).strip()) + '"'
             
-            content = re.sub(r'd="([^"]+)"', optimize_path, content)
+            if 'd="' in content:
+                content = _PATH_DATA.sub(optimize_path, content)
             
             return content
         except Exception as e:
@@ -739,7 +963,7 @@ class SpecialArtifactGenerator:
         self.logger.debug("Optimizing React component.")
         try:
             # Remove console.log statements
-            content = re.sub(r'\s*console\.log\([^)]*\);?\n?', '', content)
+            content = _strip_console_logs(content)
             
             # Optimize imports by sorting
             def optimize_import(match):
@@ -747,7 +971,7 @@ class SpecialArtifactGenerator:
                 items = sorted(item.strip() for item in items)
                 return f"import {{ {', '.join(items)} }} from 'react';"
             
-            content = re.sub(r'import {([^}]+)} from \'react\';', optimize_import, content)
+            content = _REACT_NAMED_IMPORT.sub(optimize_import, content)
             
             return content
         except Exception as e:
@@ -758,9 +982,9 @@ class SpecialArtifactGenerator:
         """Optimize chart configuration."""
         self.logger.debug("Optimizing chart configuration.")
         try:
-            # Remove unnecessary whitespace
-            content = re.sub(r'\s+', ' ', content)
-            return content
+            # Re-serialize compactly; collapsing whitespace textually would
+            # also rewrite runs of spaces inside string values
+            return json.dumps(json.loads(content), separators=(',', ':'))
         except Exception as e:
             self.logger.error(f"Chart optimization failed: {str(e)}")
             raise ArtifactError(f"Chart optimization failed: {str(e)}")
@@ -787,9 +1011,9 @@ class SpecialArtifactGenerator:
             issues.append("SVG should specify a role attribute.")
             
         # Check for interactive elements
-        interactive_elements = re.findall(r'<(a|button)[^>]*>', content, re.IGNORECASE)
+        interactive_elements = _SVG_INTERACTIVE.findall(content)
         for element in interactive_elements:
-            if not re.search(r'aria-label=["\'][^"\']+["\']', element, re.IGNORECASE):
+            if not _ARIA_LABEL.search(element):
                 issues.append(f"<{element}> should have an aria-label for accessibility.")
                 
         return issues
@@ -800,19 +1024,19 @@ class SpecialArtifactGenerator:
         issues = []
         
         # Check for semantic HTML
-        if re.search(r'<div[^>]*>', content) and not re.search(r'<(header|footer|main|nav|section|article|aside)>', content):
+        if _DIV_TAG.search(content) and not _SEMANTIC_TAG.search(content):
             issues.append("Consider using semantic HTML elements instead of excessive <div> tags.")
         
         # Check for image alt text
-        images = re.findall(r'<img[^>]+>', content, re.IGNORECASE)
+        images = _IMG_TAG.findall(content)
         for img in images:
-            if not re.search(r'alt=["\']([^"\']+)["\']', img, re.IGNORECASE):
+            if not _ALT_ATTR.search(img):
                 issues.append("Images must have alt text for accessibility.")
         
         # Check for button accessibility
-        buttons = re.findall(r'<button[^>]+>', content, re.IGNORECASE)
+        buttons = _BUTTON_TAG.findall(content)
         for button in buttons:
-            if not re.search(r'aria-label=["\']([^"\']+)["\']', button, re.IGNORECASE):
+            if not _ARIA_LABEL.search(button):
                 issues.append("Buttons should have aria-labels or meaningful content.")
         
         return issues
@@ -821,16 +1045,30 @@ class SpecialArtifactGenerator:
     # Utilities
     # =====================
 
-    def _generate_checksum(self, content: str) -> str:
-        """Generate checksum for content."""
-        import hashlib
-        checksum = hashlib.sha256(content.encode('utf-8')).hexdigest()
-        self.logger.debug(f"Generated checksum: {checksum}")
+    def _generate_checksum(self, content: Union[str, bytes, memoryview]) -> str:
+        """Generate checksum for content, given as text or a UTF-8 bytes-like object."""
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        if self._use_xxhash:
+            checksum = xxhash.xxh64(content).hexdigest()
+        else:
+            checksum = hashlib.sha256(content).hexdigest()
+        self.logger.debug("Generated checksum: %s", checksum)
         return checksum
 
-    def _format_attributes(self, attrs: Dict[str, Any]) -> str:
-        """Format element attributes."""
-        return ' '.join(f'{k}="{v}"' for k, v in attrs.items())
+    def _format_attributes(self,
+                           attrs: Dict[str, Any],
+                           extra: Optional[Dict[str, Any]] = None) -> str:
+        """Format element attributes.
+
+        Extra attributes override matching keys in place and the rest follow,
+        as if the two dicts had been merged.
+        """
+        if not extra:
+            return ' '.join(f'{k}="{v}"' for k, v in attrs.items())
+        parts = [f'{k}="{extra.get(k, v)}"' for k, v in attrs.items()]
+        parts.extend(f'{k}="{v}"' for k, v in extra.items() if k not in attrs)
+        return ' '.join(parts)
 
     # =====================
     # Extensibility
@@ -850,6 +1088,7 @@ class SpecialArtifactGenerator:
             self.formatters[artifact_type] = formatter
         if optimizer:
             self.optimizers[artifact_type] = optimizer
+        self._result_cache.clear()
         self.logger.info(f"Added custom generator for {artifact_type.value}.")
 
     def remove_generator(self, artifact_type: ArtifactType) -> bool:
@@ -864,6 +1103,7 @@ class SpecialArtifactGenerator:
             del self.formatters[artifact_type]
         if artifact_type in self.optimizers:
             del self.optimizers[artifact_type]
+        self._result_cache.clear()
         if removed:
             self.logger.info(f"Removed generator for {artifact_type.value}.")
         return removed
@@ -2,14 +2,205 @@
 
 from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from contextvars import ContextVar
 from uuid import UUID
 import re
 import ast
+import string
+from functools import cached_property, lru_cache
 from models.conversation import Message
 from models.response import Response, ResponseType, ResponseMetadata
 from core.exceptions import ResponseGenerationError
 
+try:
+    from lxml import etree as lxml_etree, html as lxml_html
+except ImportError:
+    lxml_etree = lxml_html = None
+
+# Pre-processing patterns
+_WHITESPACE = re.compile(r'\s+')
+_COLON_WORD = re.compile(r'(?<!["\']):(\w+):')
+_PUNCTUATION_GAP = re.compile(r'([.,!?])(\w)')
+_EXCESS_NEWLINES = re.compile(r'\n{3,}')
+_SHEBANG = re.compile(r'^#!.*\n')
+
+# Formatting patterns
+_MD_HEADER = re.compile(r'^(#{1,6})\s*', re.MULTILINE)
+_MD_BULLET = re.compile(r'^\s*[-*+]\s*', re.MULTILINE)
+_MD_NUMBERED = re.compile(r'^\s*(\d+\.)\s*', re.MULTILINE)
+_MD_FENCE = re.compile(r'```\s*(\w*)\n')
+_SENTENCE_START = re.compile(r'(^|\. )([^\W\d_])')
+_CODE_INDENTS = tuple('    ' * level for level in range(64))
+_DEDENT_KEYWORDS = frozenset(('return', 'break', 'continue', 'pass'))
+_STACK_TRACE = re.compile(r'Traceback \(most recent call last\):(.*?)(?=\w+Error:|$)', re.DOTALL)
+
+# Validation patterns
+_TAG_NAME_CHARS = frozenset(string.ascii_letters + string.digits)
+# Elements the lxml formatter may put on lines of their own; whitespace
+# inside pre and textarea is rendered, so it is never reindented
+_BLOCK_TAGS = frozenset((
+    'address', 'article', 'aside', 'blockquote', 'body', 'dd', 'details', 'dialog',
+    'div', 'dl', 'dt', 'fieldset', 'figcaption', 'figure', 'footer', 'form',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav',
+    'ol', 'p', 'pre', 'section', 'summary', 'table', 'tbody', 'td', 'tfoot',
+    'th', 'thead', 'tr', 'ul'
+))
+_WHITESPACE_TAGS = frozenset(('pre', 'textarea'))
+_MD_VALID_HEADER = re.compile(r'^#{1,6}\s')
+_ERROR_TIMESTAMP = re.compile(r'\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\]')
+
+# Enhancement patterns
+_SENTENCE_END = re.compile(r'\. ')
+_SPACE_BEFORE_STOP = re.compile(r'\s+([.,])')
+_SENTENCE_GAP = re.compile(r'([.!?])\s*([A-Z])')
+_ENHANCED_TAG = re.compile(r'<(img|a|button)(?=[\s/>])([^>]*)>')
+# '$-_' spans digits, upper case and most URL punctuation (including '%')
+_BARE_URL = re.compile(r'(?<!\[)(?<!\()https?://[!$-_a-z]+')
+_LEADING_WHITESPACE = re.compile(r'^\s*')
+
+# Timestamp of the response being built: None outside build_response,
+# '' until first needed, then the formatted time reused for the whole build
+_build_timestamp: ContextVar[Optional[str]] = ContextVar('_build_timestamp', default=None)
+
+_REGEX_METACHARACTERS = frozenset('.^$*+?{}[]\\|()')
+
+@lru_cache(maxsize=256)
+def _prohibited_matcher(pattern: str) -> callable:
+    """Return a predicate equivalent to re.search(pattern, text).
+
+    Plain literals and '^word' prefixes are answered with string methods
+    instead of the regex engine.
+    """
+    if pattern.startswith('^') and pattern[1:].isalnum():
+        prefix = pattern[1:]
+        return lambda text: text.startswith(prefix)
+    if _REGEX_METACHARACTERS.isdisjoint(pattern):
+        return lambda text: pattern in text
+    return re.compile(pattern).search
+
+@lru_cache(maxsize=256)
+def _syntax_error(content: str) -> Optional[str]:
+    """Return the SyntaxError message for Python source, or None if it parses."""
+    try:
+        ast.parse(content)
+    except SyntaxError as e:
+        return str(e)
+    return None
+
+def _wrap_paragraph(paragraph: str, width: int = 80) -> str:
+    """Greedily wrap words onto lines of at most width characters.
+
+    Words longer than width get a line of their own, matching
+    textwrap.fill(break_long_words=False) on single-spaced text.
+    """
+    lines = []
+    current_line = []
+    current_length = -1
+    for word in paragraph.split():
+        word_length = len(word)
+        if not current_line or current_length + word_length + 1 <= width:
+            current_line.append(word)
+            current_length += word_length + 1
+        else:
+            lines.append(' '.join(current_line))
+            current_line = [word]
+            current_length = word_length
+    if current_line:
+        lines.append(' '.join(current_line))
+    return '\n'.join(lines)
+
+def _html_tag_errors(content: str) -> List[str]:
+    """Return unbalanced-tag errors, scanning '<name ...>' tags with str.find."""
+    errors = []
+    tag_stack = []
+    length = len(content)
+    position = 0
+    while True:
+        start = content.find('<', position)
+        if start < 0:
+            break
+        closing = content.startswith('/', start + 1)
+        name_start = start + 2 if closing else start + 1
+        name_end = name_start
+        while name_end < length and content[name_end] in _TAG_NAME_CHARS:
+            name_end += 1
+        if name_end == name_start:
+            # Not a tag (comment, doctype, stray '<'); resume after it
+            position = start + 1
+            continue
+        end = content.find('>', name_end)
+        if end < 0:
+            break
+        position = end + 1
+
+        tag_name = content[name_start:name_end]
+        if closing:
+            if not tag_stack or tag_stack[-1] != tag_name:
+                errors.append(f"Unmatched closing tag: {tag_name}")
+                continue
+            tag_stack.pop()
+        elif content[end - 1] != '/':
+            tag_stack.append(tag_name)
+
+    if tag_stack:
+        errors.append(f"Unclosed tags: {', '.join(tag_stack)}")
+    return errors
+
+def _indent_html(element: Any, level: int = 1) -> None:
+    """Indent an lxml element's children in place, two spaces per level.
+
+    Only elements holding nothing but block children are reindented, so
+    whitespace inside pre/textarea and around inline content is untouched.
+    """
+    children = list(element)
+    if (not children or element.tag in _WHITESPACE_TAGS
+            or (element.text and element.text.strip())
+            or any(child.tag not in _BLOCK_TAGS or (child.tail and child.tail.strip())
+                   for child in children)):
+        return
+    indent = '\n' + '  ' * level
+    element.text = indent
+    for child in children:
+        _indent_html(child, level + 1)
+        child.tail = indent
+    children[-1].tail = indent[:-2]
+
+def _format_html_tree(content: str) -> Optional[str]:
+    """Pretty-print an HTML fragment with lxml; None if lxml should not take it.
+
+    Whole documents are left to the line-based formatter so their doctype,
+    <html> and <head> survive. So is markup the validator would reject,
+    since libxml2 would silently repair it, and markup with top-level text
+    or inline elements, whose spacing the one-block-per-line output changes.
+    """
+    if lxml_html is None or content[:9].lower().startswith(('<!doctype', '<html>', '<html ')):
+        return None
+    if _html_tag_errors(content):
+        return None
+    try:
+        fragments = lxml_html.fragments_fromstring(content)
+    except (lxml_etree.ParserError, ValueError):
+        return None
+
+    parts = []
+    for fragment in fragments:
+        if (isinstance(fragment, str) or fragment.tag not in _BLOCK_TAGS
+                or (fragment.tail and fragment.tail.strip())):
+            return None
+        _indent_html(fragment)
+        parts.append(lxml_html.tostring(fragment, encoding='unicode').strip())
+    return '\n'.join(parts)
+
+def _identity(content: str) -> str:
+    """Pipeline stage for types without a processor."""
+    return content
+
+def _always_valid(content: str) -> Dict[str, Any]:
+    """Validator for types without one."""
+    return {'valid': True, 'errors': [], 'warnings': []}
+
 @dataclass
 class ResponseConfig:
     """Configuration for response generation."""
@@ -29,12 +220,6 @@ class ResponseBuilder:
 
     def __init__(self, config: Optional[ResponseConfig] = None):
         self.config = config or ResponseConfig(response_type=ResponseType.TEXT)
-        self.formatters: Dict[ResponseType, callable] = {}
-        self.validators: Dict[ResponseType, callable] = {}
-        self.pre_processors: Dict[str, callable] = {}
-        self.post_processors: Dict[str, callable] = {}
-        self.enhancers: Dict[ResponseType, callable] = {}
-        self._initialize_processors()
 
     def build_response(self,
                       content: str,
@@ -42,40 +227,36 @@ class ResponseBuilder:
                       context: Optional[Dict[str, Any]] = None,
                       metadata: Optional[Dict[str, Any]] = None) -> Response:
         """Build a formatted response."""
+        token = _build_timestamp.set('') if _build_timestamp.get() is None else None
         try:
             response_type = response_type or self.config.response_type
+            pre_process, format_, validate, enhance, post_process = self._pipeline[response_type]
 
             # Pre-process content
-            processed_content = self._pre_process_content(content, response_type)
+            processed_content = pre_process(content)
 
             # Format content
-            formatted_content = self._format_content(processed_content, response_type)
+            formatted_content = format_(processed_content)
 
             # Validate content
-            validation_result = self._validate_content(formatted_content, response_type)
+            validation_result = validate(formatted_content)
             if not validation_result['valid']:
                 raise ResponseGenerationError(
                     f"Response validation failed: {', '.join(validation_result['errors'])}"
                 )
 
             # Enhance content
-            enhanced_content = self._enhance_content(formatted_content, response_type)
+            enhanced_content = enhance(formatted_content)
 
             # Post-process content
-            final_content = self._post_process_content(enhanced_content, response_type)
+            final_content = post_process(enhanced_content)
 
             # Truncate content if necessary
             if self.config.max_length:
                 final_content = self._truncate_content(final_content, self.config.max_length)
 
             # Create response metadata
-            response_metadata = ResponseMetadata(
-                timestamp=datetime.now(),
-                type=response_type,
-                length=len(final_content),
-                context=context or {},
-                custom_data=metadata or {}
-            ) if self.config.include_metadata else None
+            response_metadata = self._make_metadata(final_content, response_type, context, metadata)
 
             # Create response
             response = Response(
@@ -88,84 +269,131 @@ class ResponseBuilder:
 
         except Exception as e:
             raise ResponseGenerationError(f"Response building failed: {str(e)}")
-
-    def _initialize_processors(self) -> None:
-        """Initialize response processors."""
-        # Pre-processors
-        self.pre_processors.update({
+        finally:
+            if token is not None:
+                _build_timestamp.reset(token)
+
+    def build_responses(self,
+                        contents: List[str],
+                        response_type: Optional[ResponseType] = None,
+                        context: Optional[Dict[str, Any]] = None,
+                        metadata: Optional[Dict[str, Any]] = None,
+                        max_workers: int = 1) -> List[Response]:
+        """Build formatted responses for a batch of contents.
+
+        The whole batch shares one error timestamp; with ``max_workers`` above
+        one the responses are built on a thread pool. Results are returned in
+        input order.
+        """
+        if not contents:
+            return []
+
+        response_type = response_type or self.config.response_type
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        def build(content: str) -> Response:
+            token = _build_timestamp.set(timestamp)
+            try:
+                return self.build_response(content, response_type, context, metadata)
+            finally:
+                _build_timestamp.reset(token)
+
+        if max_workers <= 1 or len(contents) == 1:
+            return [build(content) for content in contents]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(build, contents))
+
+    def _timestamp(self) -> str:
+        """Get the error timestamp, formatted once per build_response call."""
+        timestamp = _build_timestamp.get()
+        if not timestamp:
+            building = timestamp is not None
+            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            if building:
+                _build_timestamp.set(timestamp)
+        return timestamp
+
+    def _make_metadata(self,
+                       content: str,
+                       response_type: ResponseType,
+                       context: Optional[Dict[str, Any]] = None,
+                       metadata: Optional[Dict[str, Any]] = None) -> Optional[ResponseMetadata]:
+        """Create response metadata, or None when metadata is disabled."""
+        if not self.config.include_metadata:
+            return None
+        return ResponseMetadata(
+            timestamp=datetime.now(),
+            type=response_type,
+            length=len(content),
+            context=context or {},
+            custom_data=metadata or {}
+        )
+
+    @cached_property
+    def pre_processors(self) -> Dict[str, callable]:
+        """Pre-processors keyed by response type value, built on first access."""
+        return {
             'text': self._pre_process_text,
             'code': self._pre_process_code,
             'error': self._pre_process_error
-        })
+        }
 
-        # Formatters
-        self.formatters.update({
+    @cached_property
+    def formatters(self) -> Dict[ResponseType, callable]:
+        """Response formatters, built on first access."""
+        return {
             ResponseType.TEXT: self._format_text,
             ResponseType.HTML: self._format_html,
             ResponseType.MARKDOWN: self._format_markdown,
             ResponseType.CODE: self._format_code,
             ResponseType.ERROR: self._format_error
-        })
+        }
 
-        # Validators
-        self.validators.update({
+    @cached_property
+    def validators(self) -> Dict[ResponseType, callable]:
+        """Response validators, built on first access."""
+        return {
             ResponseType.TEXT: self._validate_text,
             ResponseType.HTML: self._validate_html,
             ResponseType.MARKDOWN: self._validate_markdown,
             ResponseType.CODE: self._validate_code,
             ResponseType.ERROR: self._validate_error
-        })
+        }
 
-        # Enhancers
-        self.enhancers.update({
+    @cached_property
+    def enhancers(self) -> Dict[ResponseType, callable]:
+        """Response enhancers, built on first access."""
+        return {
             ResponseType.TEXT: self._enhance_text,
             ResponseType.HTML: self._enhance_html,
             ResponseType.MARKDOWN: self._enhance_markdown,
             ResponseType.CODE: self._enhance_code,
             ResponseType.ERROR: self._enhance_error
-        })
+        }
 
-        # Post-processors
-        self.post_processors.update({
+    @cached_property
+    def post_processors(self) -> Dict[str, callable]:
+        """Post-processors keyed by response type value, built on first access."""
+        return {
             'text': self._post_process_text,
             'code': self._post_process_code,
             'error': self._post_process_error
-        })
-
-    def _pre_process_content(self, content: str, response_type: ResponseType) -> str:
-        """Pre-process response content."""
-        processor = self.pre_processors.get(response_type.value)
-        if not processor:
-            return content
-        return processor(content)
-
-    def _format_content(self, content: str, response_type: ResponseType) -> str:
-        """Format response content."""
-        formatter = self.formatters.get(response_type)
-        if not formatter:
-            return content
-        return formatter(content)
-
-    def _validate_content(self, content: str, response_type: ResponseType) -> Dict[str, Any]:
-        """Validate response content."""
-        validator = self.validators.get(response_type)
-        if not validator:
-            return {'valid': True, 'errors': [], 'warnings': []}
-        return validator(content)
-
-    def _enhance_content(self, content: str, response_type: ResponseType) -> str:
-        """Enhance response content."""
-        enhancer = self.enhancers.get(response_type)
-        if not enhancer:
-            return content
-        return enhancer(content)
+        }
 
-    def _post_process_content(self, content: str, response_type: ResponseType) -> str:
-        """Post-process response content."""
-        processor = self.post_processors.get(response_type.value)
-        if not processor:
-            return content
-        return processor(content)
+    @cached_property
+    def _pipeline(self) -> Dict[ResponseType, tuple]:
+        """Each type's (pre, format, validate, enhance, post) stages, resolved on first build."""
+        return {
+            rt: (
+                self.pre_processors.get(rt.value) or _identity,
+                self.formatters.get(rt) or _identity,
+                self.validators.get(rt) or _always_valid,
+                self.enhancers.get(rt) or _identity,
+                self.post_processors.get(rt.value) or _identity
+            )
+            for rt in ResponseType
+        }
 
     # =====================
     # Pre-processors
@@ -175,13 +403,15 @@ class ResponseBuilder:
         """Pre-process text response."""
         # Clean up whitespace
         content = content.strip()
-        content = re.sub(r'\s+', ' ', content)
+        content = _WHITESPACE.sub(' ', content)
 
         # Handle quotes
-        content = re.sub(r'(?<!["\']):(\w+):', r'"\1"', content)
+        if ':' in content:
+            content = _COLON_WORD.sub(r'"\1"', content)
 
         # Add spacing around punctuation
-        content = re.sub(r'([.,!?])(\w)', r'\1 \2', content)
+        if '.' in content or ',' in content or '!' in content or '?' in content:
+            content = _PUNCTUATION_GAP.sub(r'\1 \2', content)
 
         return content
 
@@ -192,11 +422,11 @@ class ResponseBuilder:
 
         # Normalize empty lines
         content = '\n'.join(lines)
-        content = re.sub(r'\n{3,}', '\n\n', content)
+        content = _EXCESS_NEWLINES.sub('\n\n', content)
 
         # Remove shebang if present
         if content.startswith('#!'):
-            content = re.sub(r'^#!.*\n', '', content)
+            content = _SHEBANG.sub('', content)
 
         return content
 
@@ -207,7 +437,7 @@ class ResponseBuilder:
             content = f"Error: {content}"
 
         # Add timestamp
-        content = f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {content}"
+        content = f"[{self._timestamp()}] {content}"
 
         return content
 
@@ -223,30 +453,14 @@ class ResponseBuilder:
         # Apply formatting rules
         if self.config.formatting_rules:
             if self.config.formatting_rules.get('capitalize_sentences', False):
-                content = '. '.join(s.capitalize() for s in content.split('. '))
+                # Upper-case only the first letter so acronyms like NASA survive
+                content = _SENTENCE_START.sub(lambda m: m.group(1) + m.group(2).upper(), content)
 
             if self.config.formatting_rules.get('wrap_paragraphs', False):
                 paragraphs = content.split('\n\n')
                 wrapped_paragraphs = []
                 for para in paragraphs:
-                    if len(para) > 80:
-                        words = para.split()
-                        lines = []
-                        current_line = []
-                        current_length = 0
-                        for word in words:
-                            if current_length + len(word) + 1 <= 80:
-                                current_line.append(word)
-                                current_length += len(word) + 1
-                            else:
-                                lines.append(' '.join(current_line))
-                                current_line = [word]
-                                current_length = len(word)
-                        if current_line:
-                            lines.append(' '.join(current_line))
-                        wrapped_paragraphs.append('\n'.join(lines))
-                    else:
-                        wrapped_paragraphs.append(para)
+                    wrapped_paragraphs.append(_wrap_paragraph(para) if len(para) > 80 else para)
                 content = '\n\n'.join(wrapped_paragraphs)
 
         # Apply length limits
@@ -260,6 +474,11 @@ class ResponseBuilder:
         # Basic HTML formatting
         content = content.strip()
 
+        # Let libxml2 parse and indent the markup when lxml is installed
+        formatted = _format_html_tree(content)
+        if formatted is not None:
+            return formatted
+
         # Format indentation
         lines = content.split('\n')
         indent_level = 0
@@ -286,14 +505,14 @@ class ResponseBuilder:
         content = content.strip()
 
         # Format headers
-        content = re.sub(r'^(#{1,6})\s*', r'\1 ', content, flags=re.MULTILINE)
+        content = _MD_HEADER.sub(r'\1 ', content)
 
         # Format lists
-        content = re.sub(r'^\s*[-*+]\s*', '- ', content, flags=re.MULTILINE)
-        content = re.sub(r'^\s*(\d+\.)\s*', r'\1 ', content, flags=re.MULTILINE)
+        content = _MD_BULLET.sub('- ', content)
+        content = _MD_NUMBERED.sub(r'\1 ', content)
 
         # Format code blocks
-        content = re.sub(r'```\s*(\w*)\n', r'```\1\n', content)
+        content = _MD_FENCE.sub(r'```\1\n', content)
 
         return content
 
@@ -303,7 +522,7 @@ class ResponseBuilder:
         content = content.strip()
 
         # Remove excessive blank lines
-        content = re.sub(r'\n{3,}', '\n\n', content)
+        content = _EXCESS_NEWLINES.sub('\n\n', content)
 
         # Format indentation
         lines = content.split('\n')
@@ -312,14 +531,15 @@ class ResponseBuilder:
 
         for line in lines:
             stripped = line.strip()
-            if stripped.endswith(':'):
-                formatted_lines.append('    ' * indent_level + stripped)
-                indent_level += 1
-            elif stripped in ['return', 'break', 'continue', 'pass']:
+            if stripped in _DEDENT_KEYWORDS:
                 indent_level = max(0, indent_level - 1)
-                formatted_lines.append('    ' * indent_level + stripped)
+            if indent_level < len(_CODE_INDENTS):
+                indent = _CODE_INDENTS[indent_level]
             else:
-                formatted_lines.append('    ' * indent_level + stripped)
+                indent = '    ' * indent_level
+            formatted_lines.append(indent + stripped)
+            if stripped.endswith(':'):
+                indent_level += 1
 
         content = '\n'.join(formatted_lines)
 
@@ -333,11 +553,10 @@ class ResponseBuilder:
 
         # Add timestamp
         if self.config.formatting_rules and self.config.formatting_rules.get('timestamp_errors', True):
-            content = f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {content}"
+            content = f"[{self._timestamp()}] {content}"
 
         # Add stack trace formatting if present
-        stack_trace_match = re.search(r'Traceback \(most recent call last\):(.*?)(?=\w+Error:|$)', 
-                                      content, re.DOTALL)
+        stack_trace_match = _STACK_TRACE.search(content)
         if stack_trace_match:
             stack_trace = stack_trace_match.group(1)
             formatted_trace = '\n'.join('  ' + line.strip() 
@@ -367,21 +586,25 @@ class ResponseBuilder:
 
             prohibited_patterns = self.config.validation_rules.get('prohibited_patterns', [])
             for pattern in prohibited_patterns:
-                if re.search(pattern, content):
+                if _prohibited_matcher(pattern)(content):
                     errors.append(f"Content contains prohibited pattern: {pattern}")
 
+        # Sentence and quote checks can be switched off through validation_rules
+        rules = self.config.validation_rules or {}
+
         # Content formatting
-        sentences = content.split('. ')
-        for i, sentence in enumerate(sentences):
-            if sentence and sentence[0].islower():
-                warnings.append(f"Sentence {i+1} does not start with a capital letter")
-            if sentence and not sentence.strip('.').strip():
-                errors.append(f"Empty sentence at position {i+1}")
+        if rules.get('check_sentences', True):
+            sentences = content.split('. ')
+            for i, sentence in enumerate(sentences):
+                if sentence and sentence[0].islower():
+                    warnings.append(f"Sentence {i+1} does not start with a capital letter")
+                if sentence and not sentence.strip('.').strip():
+                    errors.append(f"Empty sentence at position {i+1}")
 
         # Quotation marks
-        quotes = re.findall(r'["\']', content)
-        if len(quotes) % 2 != 0:
-            errors.append("Unmatched quotation marks")
+        if rules.get('check_quotes', True):
+            if (content.count('"') + content.count("'")) & 1:
+                errors.append("Unmatched quotation marks")
 
         return {
             'valid': len(errors) == 0,
@@ -399,19 +622,7 @@ class ResponseBuilder:
             return {'valid': False, 'errors': errors, 'warnings': warnings}
 
         # Check for balanced tags
-        tag_stack = []
-        for tag in re.finditer(r'</?([a-zA-Z0-9]+)[^>]*>', content):
-            tag_name = tag.group(1)
-            if tag.group(0).startswith('</'):
-                if not tag_stack or tag_stack[-1] != tag_name:
-                    errors.append(f"Unmatched closing tag: {tag_name}")
-                    continue
-                tag_stack.pop()
-            elif not tag.group(0).endswith('/>') and not tag.group(0).startswith('<!'):
-                tag_stack.append(tag_name)
-
-        if tag_stack:
-            errors.append(f"Unclosed tags: {', '.join(tag_stack)}")
+        errors.extend(_html_tag_errors(content))
 
         return {
             'valid': len(errors) == 0,
@@ -436,7 +647,7 @@ class ResponseBuilder:
         # Check for valid headers
         for line in content.split('\n'):
             if line.startswith('#'):
-                if not re.match(r'^#{1,6}\s', line):
+                if not _MD_VALID_HEADER.match(line):
                     errors.append("Invalid header format")
 
         return {
@@ -454,20 +665,24 @@ class ResponseBuilder:
             errors.append("Code content cannot be empty")
             return {'valid': False, 'errors': errors, 'warnings': warnings}
 
-        # Check for basic syntax issues
-        try:
-            ast.parse(content)
-        except SyntaxError as e:
-            errors.append(f"Invalid code syntax: {str(e)}")
+        # Check for basic syntax issues; repeated fragments reuse the parse
+        syntax_error = _syntax_error(content)
+        if syntax_error:
+            errors.append(f"Invalid code syntax: {syntax_error}")
 
-        # Check indentation consistency
-        lines = content.split('\n')
+        # Check indentation consistency and line length in one pass;
+        # length warnings are reported after the other checks
         indent_size = self.config.style_guide.get('indent_size') if self.config.style_guide else 4
-        for i, line in enumerate(lines, 1):
-            if line.strip():  # Ignore empty lines
-                leading_spaces = len(line) - len(line.lstrip(' '))
+        max_line_length = self.config.style_guide.get('max_line_length', 80) if self.config.style_guide else 80
+        length_warnings = []
+        for i, line in enumerate(content.split('\n'), 1):
+            line_length = len(line)
+            if line and not line.isspace():  # Ignore empty lines
+                leading_spaces = line_length - len(line.lstrip(' '))
                 if leading_spaces % indent_size != 0:
                     warnings.append(f"Inconsistent indentation at line {i}")
+            if line_length > max_line_length:
+                length_warnings.append(f"Line {i} exceeds maximum length of {max_line_length}")
 
         # Check for common issues
         if 'import' in content and not content.strip().startswith('import'):
@@ -477,10 +692,7 @@ class ResponseBuilder:
             warnings.append("Tab characters found, consider using spaces")
 
         # Line length
-        max_line_length = self.config.style_guide.get('max_line_length', 80) if self.config.style_guide else 80
-        for i, line in enumerate(lines, 1):
-            if len(line) > max_line_length:
-                warnings.append(f"Line {i} exceeds maximum length of {max_line_length}")
+        warnings.extend(length_warnings)
 
         return {
             'valid': len(errors) == 0,
@@ -502,7 +714,7 @@ class ResponseBuilder:
 
         # Check for timestamp
         if self.config.formatting_rules and self.config.formatting_rules.get('timestamp_errors', True):
-            if not re.match(r'\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\]', content):
+            if not _ERROR_TIMESTAMP.match(content):
                 warnings.append("Error message should include timestamp")
 
         return {
@@ -518,42 +730,49 @@ class ResponseBuilder:
     def _enhance_text(self, content: str) -> str:
         """Enhance text content."""
         # Fix common formatting issues
-        content = re.sub(r'\s+\.', '.', content)  # Fix space before period
-        content = re.sub(r'\s+,', ',', content)  # Fix space before comma
-        content = re.sub(r'\s+$', '', content, flags=re.MULTILINE)  # Remove trailing spaces
+        content = _SPACE_BEFORE_STOP.sub(r'\1', content)  # Fix space before period or comma
+        content = '\n'.join(line.rstrip() for line in content.split('\n')).rstrip()  # Remove trailing spaces
 
         # Ensure proper spacing after punctuation
-        content = re.sub(r'([.!?])\s*([A-Z])', r'\1 \2', content)
+        content = _SENTENCE_GAP.sub(r'\1 \2', content)
 
         return content
 
     def _enhance_html(self, content: str) -> str:
         """Enhance HTML content."""
-        # Add basic accessibility attributes
-        content = re.sub(r'<img([^>]*)>', lambda m: self._enhance_img_tag(m.group(1)), content)
-        content = re.sub(r'<a([^>]*)>', lambda m: self._enhance_anchor_tag(m.group(1)), content)
-        content = re.sub(r'<button([^>]*)>', lambda m: self._enhance_button_tag(m.group(1)), content)
+        # Add basic accessibility attributes in one pass over the tags
+        enhancers = {
+            'img': self._enhance_img_tag,
+            'a': self._enhance_anchor_tag,
+            'button': self._enhance_button_tag
+        }
+        content = _ENHANCED_TAG.sub(lambda m: enhancers[m.group(1)](m.group(2)), content)
 
         return content
 
     def _enhance_markdown(self, content: str) -> str:
         """Enhance Markdown content."""
-        # Add reference links for URLs
-        urls = list(re.finditer(r'(?<!\[)(?<!\()http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', content))
-        for i, match in enumerate(urls, 1):
+        # Add reference links for URLs, numbering each distinct URL once
+        references: Dict[str, int] = {}
+
+        def add_reference(match):
             url = match.group(0)
-            reference = f'[{i}]'
-            content = content.replace(url, f'[{url}]{reference}')
-            content += f'\n{reference}: {url}'
+            number = references.setdefault(url, len(references) + 1)
+            return f'[{url}][{number}]'
+
+        content = _BARE_URL.sub(add_reference, content)
+        if references:
+            content += ''.join(f'\n[{number}]: {url}' for url, number in references.items())
 
         return content
 
     def _enhance_code(self, content: str) -> str:
         """Enhance code content."""
-        # Add basic docstring if missing
-        if not re.search(r'"""(.*?)"""', content, re.DOTALL):
+        # Add basic docstring if missing (no pair of triple quotes)
+        start = content.find('"""')
+        if start == -1 or content.find('"""', start + 3) == -1:
             lines = content.split('\n')
-            indent = re.match(r'^\s*', lines[0]).group(0) if lines else ''
+            indent = _LEADING_WHITESPACE.match(lines[0]).group(0) if lines else ''
             lines.insert(1, f'{indent}"""Add description here."""')
             content = '\n'.join(lines)
 
@@ -636,26 +855,20 @@ class ResponseBuilder:
         if len(text) <= max_length:
             return text
 
-        truncated = text[:max_length].rsplit(' ', 1)[0]
-        return truncated + '...'
+        cut = text.rfind(' ', 0, max_length)
+        return text[:cut if cut != -1 else max_length] + '...'
 
     def _truncate_content(self, content: str, max_length: int) -> str:
         """Truncate content while preserving meaning."""
         if len(content) <= max_length:
             return content
 
-        # Try to truncate at sentence boundary
-        sentences = content.split('. ')
-        truncated = []
-        current_length = 0
-
-        for sentence in sentences:
-            sentence_length = len(sentence) + 2  # +2 for '. '
-            if current_length + sentence_length <= max_length:
-                truncated.append(sentence)
-                current_length += sentence_length
-            else:
-                break
+        # Try to truncate at the last sentence boundary that fits
+        cut = None
+        for match in _SENTENCE_END.finditer(content, 0, max_length):
+            cut = match.start()
 
-        return '. '.join(truncated) + '...'
+        if cut is None:
+            return self._truncate_text(content, max_length)
+        return content[:cut] + '...'
 
@@ -1,10 +1,104 @@
 # generators/response/formatter.py
 from typing import Dict, List, Optional, Any, Union
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
+from functools import cached_property, lru_cache
 import re
 from models.response import Response, ResponseType
 
+try:
+    import black
+except ImportError:
+    black = None
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    np = njit = None
+
+# Text patterns
+_NUMBERED_ITEM = re.compile(r'\d+\.')
+_SENTENCE_SPACING = re.compile(r'([.!?])\s*([A-Z])')
+_LIST_MARKER = re.compile(r'[*+]\s')
+
+# Code keywords that continue the enclosing block one level out
+_BRANCH_KEYWORDS = frozenset(('else', 'elif', 'except', 'finally'))
+
+# Function patterns
+_PAREN_PADDING = re.compile(r'(\()\s+|\s+(\))')
+
+@lru_cache(maxsize=8)
+def _black_mode(line_length: int):
+    """Build black's Mode once per line length."""
+    return black.Mode(
+        line_length=line_length,
+        string_normalization=True,
+        is_pyi=False
+    )
+
+# Below this size the JIT call overhead outweighs the compiled wrap loop
+_JIT_WRAP_MIN_LENGTH = 4096
+
+def _wrap_ascii_kernel(buf, width):
+    """Greedy word wrap over ASCII bytes, mirroring ResponseFormatter._wrap_text.
+
+    Emits every line followed by a newline; the caller strips the result.
+    """
+    n = buf.shape[0]
+    out = np.empty(2 * n + 2, np.uint8)
+    o = 0
+    i = 0
+    current_length = 0
+    line_words = 0
+    while i < n:
+        c = buf[i]
+        # Paragraph break ('\n\n'): close the line and add the blank one
+        if c == 10 and i + 1 < n and buf[i + 1] == 10:
+            if line_words:
+                out[o] = 10
+                o += 1
+            out[o] = 10
+            o += 1
+            current_length = 0
+            line_words = 0
+            i += 2
+            continue
+        # Whitespace as str.split() sees it in ASCII
+        if c == 32 or 9 <= c <= 13 or 28 <= c <= 31:
+            i += 1
+            continue
+        start = i
+        while i < n:
+            c = buf[i]
+            if c == 32 or 9 <= c <= 13 or 28 <= c <= 31:
+                break
+            i += 1
+        word_length = i - start + 1
+        if current_length + word_length <= width:
+            if line_words:
+                out[o] = 32
+                o += 1
+            current_length += word_length
+            line_words += 1
+        else:
+            out[o] = 10
+            o += 1
+            current_length = word_length
+            line_words = 1
+        for k in range(start, i):
+            out[o] = buf[k]
+            o += 1
+    if line_words:
+        out[o] = 10
+        o += 1
+    out[o] = 10
+    o += 1
+    return out[:o]
+
+_wrap_ascii = njit(cache=True)(_wrap_ascii_kernel) if njit is not None else None
+
 @dataclass
 class FormattingConfig:
    """Configuration for response formatting."""
@@ -18,10 +112,16 @@ class FormattingConfig:
 class ResponseFormatter:
    """Formats response content based on type and style guidelines."""
 
+   # Bound once so each format_response skips the module attribute lookup
+   _now = staticmethod(datetime.now)
+
+   # Number of formatted contents kept per formatter instance
+   RESULT_CACHE_SIZE = 512
+
    def __init__(self, config: Optional[FormattingConfig] = None):
        self.config = config or FormattingConfig()
        self.formatters: Dict[ResponseType, callable] = {}
-       self.style_checkers: Dict[ResponseType, callable] = {}
+       self._result_cache: OrderedDict = OrderedDict()
        self._initialize_formatters()
 
    def format_response(self, 
@@ -32,34 +132,60 @@ class ResponseFormatter:
            # Determine format type
            format_type = format_type or response.type
 
-           # Get appropriate formatter
+           # Already formatted as this type: formatting again is wasted work
+           metadata = response.metadata
+           if metadata.get('formatted') and metadata.get('format_type') == format_type.value:
+               return response
+
+           # Get appropriate formatter; one dict lookup beats an if/elif
+           # chain over ResponseType members
            formatter = self.formatters.get(format_type)
-           if not formatter:
+           if formatter is None:
                return response
 
-           # Apply formatting
-           formatted_content = formatter(response.content)
+           # Repeated contents (retries, canned errors) reuse earlier output
+           # produced under the same config
+           content = response.content
+           cache_key = ((format_type, content, repr(self.config))
+                        if isinstance(content, str) else None)
+           formatted_content = self._result_cache.get(cache_key) if cache_key else None
+           if formatted_content is not None:
+               self._result_cache.move_to_end(cache_key)
+           else:
+               # Apply formatting
+               formatted_content = formatter(content)
+
+               # Apply style guidelines if available
+               if self.config.style_guide:
+                   formatted_content = self._apply_style_guide(
+                       formatted_content,
+                       format_type
+                   )
 
-           # Apply style guidelines if available
-           if self.config.style_guide:
-               formatted_content = self._apply_style_guide(
-                   formatted_content,
-                   format_type
-               )
+               if cache_key:
+                   self._result_cache[cache_key] = formatted_content
+                   if len(self._result_cache) > self.RESULT_CACHE_SIZE:
+                       self._result_cache.popitem(last=False)
 
            # Update response with formatted content
            response.content = formatted_content
-           response.metadata.update({
+           metadata.update({
                'formatted': True,
                'format_type': format_type.value,
-               'formatting_timestamp': datetime.now().isoformat()
+               'formatting_timestamp': self._now().isoformat()
            })
 
            return response
 
+       except FormattingError:
+           raise
        except Exception as e:
            raise FormattingError(f"Formatting failed: {str(e)}")
 
+   def clear_cache(self) -> None:
+       """Forget cached results, e.g. after replacing entries in formatters."""
+       self._result_cache.clear()
+
    def _initialize_formatters(self) -> None:
        """Initialize response formatters."""
        self.formatters.update({
@@ -69,12 +195,15 @@ class ResponseFormatter:
            ResponseType.FUNCTION: self._format_function
        })
 
-       self.style_checkers.update({
+   @cached_property
+   def style_checkers(self) -> Dict[ResponseType, callable]:
+       """Style checkers, built on first use; only a style guide needs them."""
+       return {
            ResponseType.TEXT: self._check_text_style,
            ResponseType.CODE: self._check_code_style,
            ResponseType.ERROR: self._check_error_style,
            ResponseType.FUNCTION: self._check_function_style
-       })
+       }
 
    def _format_text(self, content: str) -> str:
        """Format text content."""
@@ -85,13 +214,35 @@ class ResponseFormatter:
        if self.config.line_length:
            content = self._wrap_text(content, self.config.line_length)
 
-       # Handle paragraphs
-       content = self._format_paragraphs(content)
+       # Collapse each paragraph onto one line and set lists off with blank
+       # lines, in a single pass over the paragraphs
+       lines = []
+       append = lines.append
+       in_list = False
+       for index, chunk in enumerate(content.split('\n\n')):
+           if index:
+               append('')
+           paragraph = ' '.join(chunk.split())
 
-       # Handle lists
-       content = self._format_lists(content)
+           # Handle special paragraph types
+           if paragraph.startswith('- '):
+               paragraph = self._format_bullet_list(paragraph)
+           elif _NUMBERED_ITEM.match(paragraph):
+               paragraph = self._format_numbered_list(paragraph)
+           else:
+               # A plain paragraph after a list gets an extra blank line
+               if in_list and paragraph:
+                   in_list = False
+                   append('')
+               append(paragraph)
+               continue
+
+           if not in_list:
+               append('')
+               in_list = True
+           append(paragraph)
 
-       return content
+       return '\n'.join(lines)
 
    def _format_code(self, content: str) -> str:
        """Format code content."""
@@ -100,26 +251,33 @@ class ResponseFormatter:
            return self._format_python_code(content)
        elif self.config.code_style == "javascript":
            return self._format_javascript_code(content)
-       
-       # Default basic code formatting
+       return self._format_generic_code(content)
+
+   def _format_generic_code(self, content: str) -> str:
+       """Indent code by braces and colons when no code style applies."""
+       # Each line is overwritten in place, so no second list is built
        lines = content.split('\n')
-       formatted_lines = []
        indent_level = 0
+       indent_unit = ' ' * self.config.indent_size
+       indents = ['']  # indents[level], grown as blocks nest deeper
        
-       for line in lines:
+       for index, line in enumerate(lines):
            stripped = line.strip()
+           last = stripped[-1:]
+           
+           # Closing braces and else/elif/except/finally step back out first
+           if stripped.startswith('}') or (
+                   last == ':' and stripped.partition(' ')[0].rstrip(':') in _BRANCH_KEYWORDS):
+               indent_level = max(0, indent_level - 1)
+           lines[index] = indents[indent_level] + stripped
            
            # Adjust indentation for blocks
-           if stripped.endswith('{') or stripped.endswith(':'):
-               formatted_lines.append(' ' * (indent_level * self.config.indent_size) + stripped)
+           if last == '{' or last == ':':
                indent_level += 1
-           elif stripped.startswith('}') or stripped in ['else:', 'elif ', 'except:', 'finally:']:
-               indent_level = max(0, indent_level - 1)
-               formatted_lines.append(' ' * (indent_level * self.config.indent_size) + stripped)
-           else:
-               formatted_lines.append(' ' * (indent_level * self.config.indent_size) + stripped)
+               if indent_level == len(indents):
+                   indents.append(indents[-1] + indent_unit)
        
-       return '\n'.join(formatted_lines)
+       return '\n'.join(lines)
 
    def _format_error(self, content: str) -> str:
        """Format error content."""
@@ -159,77 +317,42 @@ class ResponseFormatter:
 
    def _wrap_text(self, text: str, length: int) -> str:
        """Wrap text to specified length."""
+       # Large ASCII texts go through the Numba-compiled loop when available
+       if _wrap_ascii is not None and len(text) >= _JIT_WRAP_MIN_LENGTH and text.isascii():
+           buf = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+           return _wrap_ascii(buf, length).tobytes().decode('ascii').strip()
+
+       # Greedy single pass over the words; textwrap.fill measured several
+       # times slower on long responses and breaks at a different width
        lines = []
+       append_line = lines.append
        for paragraph in text.split('\n\n'):
-           words = paragraph.split()
            current_line = []
+           add_word = current_line.append
            current_length = 0
            
-           for word in words:
-               word_length = len(word)
-               if current_length + word_length + 1 <= length:
-                   current_line.append(word)
-                   current_length += word_length + 1
+           for word in paragraph.split():
+               word_length = len(word) + 1
+               if current_length + word_length <= length:
+                   add_word(word)
+                   current_length += word_length
                else:
-                   lines.append(' '.join(current_line))
+                   append_line(' '.join(current_line))
                    current_line = [word]
-                   current_length = word_length + 1
+                   add_word = current_line.append
+                   current_length = word_length
            
            if current_line:
-               lines.append(' '.join(current_line))
-           lines.append('')
+               append_line(' '.join(current_line))
+           append_line('')
        
        return '\n'.join(lines).strip()
 
-   def _format_paragraphs(self, content: str) -> str:
-       """Format text paragraphs."""
-       paragraphs = content.split('\n\n')
-       formatted_paragraphs = []
-       
-       for paragraph in paragraphs:
-           # Remove excess whitespace
-           paragraph = ' '.join(paragraph.split())
-           
-           # Handle special paragraph types
-           if paragraph.startswith('- '):
-               paragraph = self._format_bullet_list(paragraph)
-           elif re.match(r'\d+\.', paragraph):
-               paragraph = self._format_numbered_list(paragraph)
-               
-           formatted_paragraphs.append(paragraph)
-           
-       return '\n\n'.join(formatted_paragraphs)
-
-   def _format_lists(self, content: str) -> str:
-       """Format bullet and numbered lists."""
-       lines = content.split('\n')
-       formatted_lines = []
-       in_list = False
-       list_indent = 0
-       
-       for line in lines:
-           if line.lstrip().startswith('- ') or re.match(r'\d+\.', line.lstrip()):
-               if not in_list:
-                   formatted_lines.append('')
-                   in_list = True
-               list_indent = len(line) - len(line.lstrip())
-               formatted_lines.append(line)
-           else:
-               if in_list and line.strip():
-                   if len(line) - len(line.lstrip()) > list_indent:
-                       formatted_lines.append(line)
-                   else:
-                       in_list = False
-                       formatted_lines.extend(['', line])
-               else:
-                   formatted_lines.append(line)
-                   
-       return '\n'.join(formatted_lines)
-
    def _format_bullet_list(self, content: str) -> str:
        """Format bullet list items."""
-       lines = content.split('\n')
-       return '\n'.join(f"- {line.lstrip('- ')}" for line in lines)
+       # Drop the indent and at most one existing '- ' marker per item
+       items = [line.lstrip() for line in content.split('\n')]
+       return '\n'.join(['- ' + (item[2:] if item.startswith('- ') else item) for item in items])
 
    def _format_numbered_list(self, content: str) -> str:
        """Format numbered list items."""
@@ -238,7 +361,7 @@ class ResponseFormatter:
        number = 1
        
        for line in lines:
-           if re.match(r'\d+\.', line):
+           if _NUMBERED_ITEM.match(line):
                formatted_lines.append(f"{number}. {line.split('.', 1)[1].lstrip()}")
                number += 1
            else:
@@ -248,25 +371,20 @@ class ResponseFormatter:
 
    def _format_python_code(self, content: str) -> str:
        """Format Python code."""
-       try:
-           import black
-           mode = black.Mode(
-               line_length=self.config.line_length or 88,
-               string_normalization=True,
-               is_pyi=False
-           )
-           return black.format_str(content, mode=mode)
-       except ImportError:
-           return self._format_code(content)
+       if black is None:
+           return self._format_generic_code(content)
+       return black.format_str(content, mode=_black_mode(self.config.line_length or 88))
 
    def _format_javascript_code(self, content: str) -> str:
        """Format JavaScript code."""
-       # Basic JS formatting
+       # Basic JS formatting; each line is overwritten in place, so no
+       # second list is built
        lines = content.split('\n')
-       formatted_lines = []
        indent_level = 0
+       indent_unit = ' ' * self.config.indent_size
+       indents = ['']  # indents[level], grown as blocks nest deeper
        
-       for line in lines:
+       for index, line in enumerate(lines):
            stripped = line.strip()
            
            # Handle line endings
@@ -276,15 +394,17 @@ class ResponseFormatter:
            
            # Handle blocks
            if stripped.endswith('{'):
-               formatted_lines.append(' ' * (indent_level * self.config.indent_size) + stripped)
+               lines[index] = indents[indent_level] + stripped
                indent_level += 1
+               if indent_level == len(indents):
+                   indents.append(indents[-1] + indent_unit)
            elif stripped.startswith('}'):
                indent_level = max(0, indent_level - 1)
-               formatted_lines.append(' ' * (indent_level * self.config.indent_size) + stripped)
+               lines[index] = indents[indent_level] + stripped
            else:
-               formatted_lines.append(' ' * (indent_level * self.config.indent_size) + stripped)
+               lines[index] = indents[indent_level] + stripped
                
-       return '\n'.join(formatted_lines)
+       return '\n'.join(lines)
 
    def _format_error_dict(self, content: Dict[str, Any]) -> str:
        """Format error dictionary."""
@@ -333,37 +453,28 @@ class ResponseFormatter:
 
    def _format_function_definition(self, content: str) -> str:
        """Format function definition."""
-       # Basic formatting for function definitions
-       lines = content.split('\n')
-       formatted_lines = []
+       # Basic formatting for function definitions: keep the signature,
+       # re-indent the body
+       signature, newline, body = content.partition('\n')
+       if not newline:
+           return signature
        
-       for i, line in enumerate(lines):
-           if i == 0:  # Function signature
-               formatted_lines.append(line)
-           else:
-               formatted_lines.append(
-                   ' ' * self.config.indent_size + line.strip()
-               )
-               
-       return '\n'.join(formatted_lines)
+       indent = ' ' * self.config.indent_size
+       return signature + '\n' + '\n'.join([indent + line.strip() for line in body.split('\n')])
 
    def _format_function_call(self, content: str) -> str:
        """Format function call."""
        # Basic formatting for function calls
-       parts = content.split('(', 1)
-       if len(parts) != 2:
+       func_name, paren, args = content.partition('(')
+       if not paren:
            return content
            
-       func_name, args = parts
        args = args.rstrip(')')
        
        # Format arguments
        if ',' in args:
-           arg_parts = args.split(',')
-           formatted_args = ',\n'.join(
-               ' ' * (len(func_name) + 1) + arg.strip()
-               for arg in arg_parts
-           )
+           indent = ' ' * (len(func_name) + 1)
+           formatted_args = ',\n'.join([indent + arg.strip() for arg in args.split(',')])
            return f"{func_name}(\n{formatted_args}\n)"
            
        return f"{func_name}({args})"
@@ -388,16 +499,16 @@ class ResponseFormatter:
        
        # Check sentence spacing
        def fix_sentence_spacing(text):
-           return re.sub(r'([.!?])\s*([A-Z])', r'\1  \2', text)
+           return _SENTENCE_SPACING.sub(r'\1  \2', text)
        
-       if re.search(r'([.!?])\s*([A-Z])', content):
+       if _SENTENCE_SPACING.search(content):
            issues.append(('sentence_spacing', fix_sentence_spacing))
            
        # Check list consistency
        def fix_list_markers(text):
-           return re.sub(r'[*+]\s', '- ', text)
+           return _LIST_MARKER.sub('- ', text)
            
-       if re.search(r'[*+]\s', content):
+       if ('*' in content or '+' in content) and _LIST_MARKER.search(content):
            issues.append(('list_markers', fix_list_markers))
            
        return issues
@@ -441,11 +552,10 @@ class ResponseFormatter:
        
        # Check parentheses spacing
        def fix_parentheses_spacing(text):
-           text = re.sub(r'\(\s+', '(', text)
-           text = re.sub(r'\s+\)', ')', text)
-           return text
+           # Keep whichever parenthesis matched, drop the padding
+           return _PAREN_PADDING.sub(r'\1\2', text)
            
-       if re.search(r'\(\s+|\s+\)', content):
+       if _PAREN_PADDING.search(content):
            issues.append(('parentheses_spacing', fix_parentheses_spacing))
            
        return issues
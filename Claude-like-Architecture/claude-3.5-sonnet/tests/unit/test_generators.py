@@ -3,11 +3,12 @@ import pytest
 from datetime import datetime
 from uuid import UUID
 from generators.response.builder import ResponseBuilder, ResponseConfig
-from generators.response.formatter import ResponseFormatter
+from generators.response.formatter import ResponseFormatter, FormattingConfig
 from generators.artifacts.code import CodeGenerator, CodeGenerationConfig
 from generators.artifacts.markdown import MarkdownGenerator, MarkdownGenerationConfig
 from generators.artifacts.special import SpecialArtifactGenerator, SpecialGenerationConfig
-from models.artifacts import ArtifactType
+from models.artifacts import ArtifactType, ArtifactError
+from models.response import Response, ResponseType
 from core.exceptions import GenerationError
 
 class TestResponseBuilder:
@@ -39,6 +40,62 @@ class TestResponseBuilder:
         assert response.type == "code"
         assert "python" in str(response.metadata.custom_data)
 
+    def test_build_responses_batch(self):
+        """Test batch response building preserves input order."""
+        builder = ResponseBuilder(ResponseConfig(
+            response_type=ResponseType.ERROR,
+            include_metadata=False
+        ))
+        responses = builder.build_responses(["first", "second", "third"], max_workers=2)
+        assert [r.content.rsplit(" ", 1)[-1] for r in responses] == ["first", "second", "third"]
+        assert len({r.content.split("]")[0] for r in responses}) == 1
+
+    def test_capitalize_sentences_keeps_acronyms(self):
+        """Test sentence capitalization leaves the rest of each sentence alone."""
+        builder = ResponseBuilder(ResponseConfig(
+            response_type=ResponseType.TEXT,
+            formatting_rules={"capitalize_sentences": True}
+        ))
+        assert builder._format_text("the NASA team. it works") == "The NASA team. It works"
+
+    def test_truncate_content(self, response_builder: ResponseBuilder):
+        """Test truncation at sentence and word boundaries."""
+        content = "First one. Second sentence here. Third."
+        assert response_builder._truncate_content(content, 20) == "First one..."
+        assert response_builder._truncate_content("Long sentence without stops", 12) == "Long..."
+
+    def test_html_formatting_keeps_markup_errors(self, response_builder: ResponseBuilder):
+        """Test lxml formatting neither repairs bad markup nor reflows <pre>."""
+        pytest.importorskip('lxml')
+        formatted = response_builder._format_html("<div><p>x</div>")
+        assert not response_builder._validate_html(formatted)['valid']
+        pre = "<pre>\n  x = 1\n    y = 2\n</pre>"
+        assert pre in response_builder._format_html(f"<div>{pre}</div>")
+
+class TestResponseFormatter:
+    def test_config_change_bypasses_cached_result(self):
+        """Test cached output is not reused once the config changes."""
+        formatter = ResponseFormatter(FormattingConfig())
+        text = "One. Two."
+        first = formatter.format_response(Response(content=text, type=ResponseType.TEXT, metadata={}))
+        formatter.config.style_guide = {'sentence_spacing': 2}
+        second = formatter.format_response(Response(content=text, type=ResponseType.TEXT, metadata={}))
+        assert first.content == "One. Two."
+        assert second.content == "One.  Two."
+
+    def test_bullet_list_strips_only_marker(self):
+        """Test bullet formatting removes one '- ' marker and nothing more."""
+        formatter = ResponseFormatter()
+        assert formatter._format_bullet_list("- item\n  - indented\n--flag\n- - nested") == \
+            "- item\n- indented\n- --flag\n- - nested"
+
+    def test_code_branches_dedent(self):
+        """Test else branches and closing braces step back one level."""
+        formatter = ResponseFormatter()
+        assert formatter._format_code("if x:\na\nelse:\nb") == "if x:\n  a\nelse:\n  b"
+        assert formatter._format_code("if (a) {\nx;\n} else {\ny;\n}") == \
+            "if (a) {\n  x;\n} else {\n  y;\n}"
+
 class TestCodeGenerator:
     @pytest.fixture
     def code_generator(self) -> CodeGenerator:
@@ -67,4 +124,76 @@ class TestCodeGenerator:
                 content="invalid python code :",
                 identifier="invalid-code",
                 title="Invalid Code"
-            )
\ No newline at end of file
+            )
+
+    def test_generate_code_artifacts_batch(self, code_generator: CodeGenerator):
+        """Test batch code generation preserves input order."""
+        artifacts = code_generator.generate_code_artifacts_batch([
+            ("def first(): return 1\n", "first", "First", None),
+            ("def second(): return 2\n", "second", "Second", {"batch": True})
+        ], max_workers=2)
+        assert [a.identifier for a in artifacts] == ["first", "second"]
+        assert artifacts[1].metadata.custom_data["batch"] is True
+
+    def test_validation_cache_reused(self, tmp_path):
+        """Test persisted validation results skip re-formatting."""
+        config = CodeGenerationConfig(
+            language="javascript",
+            cache_path=tmp_path / "validations.sqlite"
+        )
+        first = CodeGenerator(config).generate_code_artifact(
+            content="var a = 1;", identifier="cached", title="Cached"
+        )
+        generator = CodeGenerator(config)
+        generator._formatter = None
+        second = generator.generate_code_artifact(
+            content="var a = 1;", identifier="cached", title="Cached"
+        )
+        assert second.content == first.content
+        assert second.validation.valid
+
+class TestMarkdownGenerator:
+    @pytest.fixture
+    def markdown_generator(self) -> MarkdownGenerator:
+        return MarkdownGenerator(MarkdownGenerationConfig(toc_enabled=False))
+
+    def test_repeated_generation_reuses_result(self, markdown_generator: MarkdownGenerator):
+        """Test repeated content yields equal artifacts with independent validation."""
+        content = "# Title\n\nSome text with a [link](https://example.com).\n"
+        first = markdown_generator.generate_markdown_artifact(content, "doc-1", "Doc")
+        second = markdown_generator.generate_markdown_artifact(content, "doc-2", "Doc")
+        assert first.content == second.content
+        assert first.metadata.checksum == second.metadata.checksum
+        assert first.validation.warnings is not second.validation.warnings
+
+    def test_whitespace_content_rejected(self, markdown_generator: MarkdownGenerator):
+        """Test whitespace-only content is rejected before processing."""
+        with pytest.raises(ArtifactError):
+            markdown_generator.generate_markdown_artifact("   \n\n", "doc-1", "Doc")
+
+    def test_processors_run_in_registry_order(self, markdown_generator: MarkdownGenerator):
+        """Test headers are processed before links, as listed in the registry."""
+        content = "Intro\n[ref]: https://example.com\n---"
+        assert list(markdown_generator.processors)[:2] == ['headers', 'links']
+        processed = markdown_generator._process_content(content)
+        assert processed == "Intro\n## [ref]: https://example.com"
+
+    def test_registered_processors_applied(self, markdown_generator: MarkdownGenerator):
+        """Test replaced and added registry entries are used by processing."""
+        markdown_generator.processors['lists'] = lambda text: text
+        markdown_generator.processors['upper'] = str.upper
+        processed = markdown_generator._process_content("#  Title\n* item")
+        assert processed == "# TITLE\n* ITEM"
+
+    def test_cleanup_joins_bare_list_marker(self, markdown_generator: MarkdownGenerator):
+        """Test a list marker alone on its line is joined to the following text."""
+        assert markdown_generator.cleanup_markdown("- \n\ntext") == "- text\n"
+        assert markdown_generator.cleanup_markdown("1.\n  text") == "1. text\n"
+        assert markdown_generator.cleanup_markdown("-\n\n#Word") == "- #Word\n"
+        assert markdown_generator.cleanup_markdown("*\n##x y") == "* ##x y\n"
+        assert markdown_generator.cleanup_markdown("1.\n#Title") == "1. #Title\n"
+
+    def test_section_counts_include_bare_headers(self, markdown_generator: MarkdownGenerator):
+        """Test a header line without text still counts as a section."""
+        metadata = markdown_generator.extract_metadata("# Title\n###\n### Sub\n#######\n")
+        assert metadata['section_counts'] == {1: 1, 3: 2}